@@ -0,0 +1,73 @@
+"""로컬 키워드 추출기 vs Claude(extract_keywords) 비교 벤치마크
+
+헤드라인 세트는 bench/headlines/*.json 에 저장한다.
+    {"headlines": [...], "llm_keywords": [...]}   # llm_keywords는 선택
+
+llm_keywords가 없으면 analyzer.extract_keywords를 호출한다. 녹화된 카세트로
+오프라인 재현하려면 CASSETTE_MODE=replay CASSETTE_PATH=... 와 함께 실행한다.
+
+사용법:
+    python bench_keywords.py
+    python bench_keywords.py bench/headlines/2026-01-05.json -n 20
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from src import analyzer, local_extractor
+
+SETS_DIR = "bench/headlines"
+
+
+def overlap(local, llm):
+    """(정확히 일치, 포함 관계까지 인정한 일치) 비율 - LLM 키워드 기준"""
+    if not llm:
+        return 0.0, 0.0
+    local_set = set(local)
+    exact = sum(1 for kw in llm if kw in local_set)
+    partial = sum(1 for kw in llm if any(kw in l or l in kw for l in local_set))
+    return exact / len(llm), partial / len(llm)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sets", nargs="*", help="헤드라인 세트 JSON (기본: bench/headlines/*.json)")
+    parser.add_argument("-n", "--repeat", type=int, default=10, help="로컬 추출 반복 횟수")
+    args = parser.parse_args()
+
+    paths = args.sets or sorted(glob.glob(os.path.join(SETS_DIR, "*.json")))
+    if not paths:
+        print(f"⚠️  헤드라인 세트가 없습니다: {SETS_DIR}/*.json")
+        return 1
+
+    print(f"{'set':<24} {'headlines':>9} {'local(ms)':>10} {'llm(ms)':>9} "
+          f"{'local':>6} {'llm':>5} {'exact':>6} {'partial':>8}")
+    print("-" * 84)
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        headlines = data["headlines"]
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            local = local_extractor.extract_keywords(headlines)
+        local_ms = (time.perf_counter() - start) * 1000 / args.repeat
+
+        if data.get("llm_keywords"):
+            llm, llm_ms = data["llm_keywords"], None
+        else:
+            start = time.perf_counter()
+            llm = analyzer.extract_keywords(headlines)
+            llm_ms = (time.perf_counter() - start) * 1000
+
+        exact, partial = overlap(local, llm)
+        name = os.path.basename(path)[:24]
+        llm_ms_text = "recorded" if llm_ms is None else f"{llm_ms:.0f}"
+        print(f"{name:<24} {len(headlines):>9} {local_ms:>10.1f} {llm_ms_text:>9} "
+              f"{len(local):>6} {len(llm):>5} {exact:>6.0%} {partial:>8.0%}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
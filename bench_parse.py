@@ -0,0 +1,104 @@
+"""랭킹 페이지 파싱 벤치마크 (full: html.parser 전체 트리 vs fast: lxml + SoupStrainer)
+
+사용법:
+    python bench_parse.py --save        # 현재 페이지를 bench/pages/ 에 저장
+    python bench_parse.py               # 저장된 페이지로 파싱 시간/최대 메모리 측정
+    python bench_parse.py -n 50 page.html:daum
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from src import crawler, http_client
+
+PAGES_DIR = "bench/pages"
+
+PAGES = {
+    "naver_ranking": "https://news.naver.com/main/ranking/popularDay.naver",
+    "daum": "https://news.daum.net/ranking/popular/",
+}
+
+# 결과 비교용 셀렉터 (crawler의 1순위 셀렉터와 동일)
+SELECTORS = {
+    "naver_ranking": ".rankingnews_box",
+    "daum": ".list_news2 .link_txt",
+}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+
+def save_pages():
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    for source, url in PAGES.items():
+        res = http_client.get(url, headers=HEADERS)
+        res.raise_for_status()
+        path = os.path.join(PAGES_DIR, f"{source}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(res.text)
+        print(f"💾 {source}: {path} ({len(res.content):,} bytes)")
+
+
+def measure(markup, source, mode, repeat):
+    """평균 파싱 시간(ms), 최대 메모리(KB), 매칭 개수"""
+    selector = SELECTORS[source]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        soup = crawler.make_soup(markup, source, mode=mode)
+        matched = soup.select(selector)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    tracemalloc.start()
+    soup = crawler.make_soup(markup, source, mode=mode)
+    soup.select(selector)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed_ms, peak / 1024, len(matched)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pages", nargs="*", help="파일경로:소스 (기본: bench/pages/*.html)")
+    parser.add_argument("-n", "--repeat", type=int, default=20)
+    parser.add_argument("--save", action="store_true", help="현재 페이지를 내려받아 저장")
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages()
+        return
+
+    targets = []
+    for item in args.pages:
+        path, _, source = item.rpartition(":")
+        targets.append((path, source))
+    if not targets:
+        targets = [(os.path.join(PAGES_DIR, f"{s}.html"), s) for s in PAGES]
+
+    print(f"{'page':<16} {'mode':<5} {'time(ms)':>10} {'peak(KB)':>10} {'matched':>8}")
+    print("-" * 53)
+    for path, source in targets:
+        if not os.path.exists(path):
+            print(f"⚠️  {path} 없음 (먼저 --save 실행)")
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            markup = f.read()
+
+        rows = {}
+        for mode in ("full", "fast"):
+            rows[mode] = measure(markup, source, mode, args.repeat)
+            elapsed_ms, peak_kb, matched = rows[mode]
+            print(f"{source:<16} {mode:<5} {elapsed_ms:>10.2f} {peak_kb:>10.0f} {matched:>8}")
+
+        full, fast = rows["full"], rows["fast"]
+        if full[2] != fast[2]:
+            print(f"⚠️  {source}: 매칭 개수 불일치 (full={full[2]}, fast={fast[2]})")
+        print(f"{source:<16} 속도 {full[0] / fast[0]:.1f}배, 메모리 {full[1] / fast[1]:.1f}배 절감")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""리포트 렌더링 벤치마크 (legacy: html += 후 템플릿 전체 replace 두 번 vs builder: build_html_file과 같은 경로)
+
+builder 쪽은 build_html_file이 index.html을 쓰는 것과 같은 함수(load_layout,
+render_report_page)를 쓴다. CSS를 스타일시트로 빼고 공백을 줄이므로 결과 크기는
+legacy보다 작다.
+
+사용법:
+    python bench_render.py                  # 50 / 5,000 / 50,000 행
+    python bench_render.py --rows 100 20000 -n 3
+"""
+import io
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from src import builder
+
+TEMPLATE_PATH = "templates/layout.html"
+UPDATE_TIME = "📅 업데이트: 2026년 01월 01일 09시 00분"
+STYLESHEET = '<link rel="stylesheet" href="static/style.0000000000.css">'
+
+
+def make_results(rows, seed=0):
+    """가짜 키워드 분석 결과 (모두 포화도 1.5 이하라 전부 표에 들어감)"""
+    rng = random.Random(seed)
+    results = []
+    for i in range(rows):
+        volume = rng.randint(100, 200000)
+        blog = rng.randint(0, int(volume * 1.5))
+        results.append({
+            "keyword": f"테스트키워드{i}",
+            "monthly_search": volume,
+            "blog_count": blog,
+            "saturation": round(blog / volume, 2),
+            "possibility": "🟢 매우높음",
+        })
+    results.sort(key=lambda x: x["saturation"])
+    related = [
+        {"keyword": r["keyword"], "related": [f"{r['keyword']} 연관{j}" for j in range(5)]}
+        for r in results[:20]
+    ]
+    return results, related
+
+
+def legacy_keyword_report(keyword_results, related_data=None, limit=None):
+    """변경 전 builder.build_keyword_report (행마다 html +=)"""
+    
+    if not keyword_results:
+        return "<p>분석된 키워드가 없습니다.</p>"
+    
+    # 포화도 1.5 이하만 선택
+    top_keywords = [r for r in keyword_results if r["saturation"] <= 1.5][:limit]
+    
+    html = f"""
+    <div class="keyword-report">
+        <h3>📊 상위노출 가능 키워드 TOP {limit or len(top_keywords)}</h3>
+        <p class="update-info">포화도 = 블로그문서수 ÷ 월간검색량 (낮을수록 상위노출 쉬움)</p>
+        
+        <table class="keyword-table">
+            <thead>
+                <tr>
+                    <th>순위</th>
+                    <th>키워드</th>
+                    <th>월간검색량</th>
+                    <th>블로그문서수</th>
+                    <th>포화도</th>
+                    <th>상위노출</th>
+                    <th>분석</th>
+                </tr>
+            </thead>
+            <tbody>
+    """
+    
+    for idx, item in enumerate(top_keywords, 1):
+        keyword = item['keyword']
+        naver_url = f"https://search.naver.com/search.naver?query={keyword}"
+        html += f"""
+                <tr>
+                    <td>{idx}</td>
+                    <td><strong>{keyword}</strong></td>
+                    <td>{item['monthly_search']:,}</td>
+                    <td>{item['blog_count']:,}</td>
+                    <td>{item['saturation']}</td>
+                    <td>{item['possibility']}</td>
+                    <td><a href="{naver_url}" target="_blank" class="analyze-btn">🔍</a></td>
+                </tr>
+        """
+    
+    html += """
+            </tbody>
+        </table>
+    </div>
+    """
+    
+    # 상위 20개 연관검색어 섹션
+    if related_data:
+        html += """
+    <div class="related-keywords">
+        <h3>🔗 상위 20개 키워드 연관검색어</h3>
+        <p class="update-info">네이버 자동완성 기반 연관검색어입니다.</p>
+        
+        <div class="related-grid">
+    """
+        for item in related_data:
+            keyword = item['keyword']
+            related = item['related']
+            naver_url = f"https://search.naver.com/search.naver?query={keyword}"
+            
+            html += f"""
+            <div class="related-card">
+                <div class="related-header">
+                    <strong>{keyword}</strong>
+                    <a href="{naver_url}" target="_blank" class="analyze-btn">🔍</a>
+                </div>
+                <ul class="related-list">
+            """
+            for rel_kw in related:
+                rel_url = f"https://search.naver.com/search.naver?query={rel_kw}"
+                html += f'<li><a href="{rel_url}" target="_blank">{rel_kw}</a></li>'
+            
+            if not related:
+                html += '<li class="no-data">연관검색어 없음</li>'
+            
+            html += """
+                </ul>
+            """
+            # AUTOCOMPLETE_DEPTH 2 이상에서 더 찾은 연관검색어
+            expanded = item.get('expanded')
+            if expanded:
+                html += '<div class="related-more">'
+                for ext_kw in expanded:
+                    ext_url = f"https://search.naver.com/search.naver?query={ext_kw}"
+                    html += f'<a href="{ext_url}" target="_blank">{ext_kw}</a>'
+                html += '</div>'
+            
+            html += """
+            </div>
+            """
+        
+        html += """
+        </div>
+    </div>
+    """
+    
+    return html
+
+
+def legacy_render(results, related, layout_text):
+    """변경 전 방식: 리포트를 html +=로 만들고 레이아웃 전체에 replace 두 번"""
+    html = legacy_keyword_report(results, related)
+    final_html = layout_text.replace("{{update_time}}", UPDATE_TIME)
+    final_html = final_html.replace("{{keyword_content}}", html)
+    out = io.StringIO()
+    out.write(final_html)
+    return out
+
+
+def builder_render(results, related, layout_text):
+    """builder 방식: 레이아웃 컴파일 + 리포트 조각을 공백 정리하며 바로 기록 (build_html_file과 같음)"""
+    layout, _ = builder.load_layout()
+    content = builder.iter_keyword_report(results, related, limit=None)
+    out = io.StringIO()
+    builder.render_report_page(out, layout, STYLESHEET, UPDATE_TIME, content)
+    return out
+
+
+def measure(fn, results, related, layout_text, repeat):
+    """평균 렌더링 시간(ms), 최대 메모리(KB), 결과 크기(KB)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(results, related, layout_text)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    tracemalloc.start()
+    fn(results, related, layout_text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024, len(out.getvalue().encode("utf-8")) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="*", default=[50, 5000, 50000])
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
+        layout_text = f.read()
+
+    print(f"{'rows':>7} {'mode':<9} {'time(ms)':>10} {'peak(KB)':>10} {'size(KB)':>10}")
+    print("-" * 50)
+    for rows in args.rows:
+        results, related = make_results(rows)
+        measured = {}
+        for mode, fn in (("legacy", legacy_render), ("builder", builder_render)):
+            measured[mode] = measure(fn, results, related, layout_text, args.repeat)
+            elapsed_ms, peak_kb, size_kb = measured[mode]
+            print(f"{rows:>7} {mode:<9} {elapsed_ms:>10.2f} {peak_kb:>10.0f} {size_kb:>10.0f}")
+        legacy, current = measured["legacy"], measured["builder"]
+        print(f"{rows:>7} 속도 {legacy[0] / current[0]:.1f}배, 메모리 {legacy[1] / current[1]:.1f}배, "
+              f"크기 {legacy[2] / current[2]:.1f}배 절감")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,49 @@
 import os
 from dotenv import load_dotenv
-from src import crawler, analyzer, builder
+from src import crawler, analyzer, builder, http_client, dedupe, llm_cache, local_extractor
+from src import rate_limit, keyword_cache, autocomplete, metrics, assets
 from src.naver_api import NaverAPI
+from src.headline_store import HeadlineStore
 
 load_dotenv()
 
+def generate_keywords(targets, known, store):
+    """6단계 키워드를 생성되는 대로 내보냄 (저장된 키워드 → AI → 실패분 로컬 대체)"""
+    for keywords in known.values():
+        yield from keywords
+
+    if os.environ.get("KEYWORD_MODE") == "local":
+        # 빠른 모드: 네트워크 호출 없이 로컬 추출기만 사용
+        print("    ⚡ 로컬 키워드 추출 모드")
+        for keywords in local_extractor.extract_keywords_by_headline(targets).values():
+            yield from keywords
+        return
+
+    llm_targets = targets
+    prefilter_top = int(os.environ.get("LLM_PREFILTER_TOP", "0"))
+    if prefilter_top and len(targets) > prefilter_top:
+        llm_targets = local_extractor.rank_headlines(targets, prefilter_top)
+        print(f"    ✂️  사전 필터: {len(targets)}개 중 상위 {len(llm_targets)}개만 AI 분석")
+
+    keyword_map = {}
+    if os.environ.get("STREAM_PIPELINE") == "1":
+        for _, keyword in analyzer.stream_keywords_by_headline(llm_targets, keyword_map):
+            yield keyword
+    else:
+        keyword_map = analyzer.extract_keywords_by_headline(llm_targets)
+        for keywords in keyword_map.values():
+            yield from keywords
+    store.save_keywords(keyword_map)
+
+    # AI가 분석하지 못한 헤드라인은 로컬 추출기로 대체 (저장소에는 기록하지 않음)
+    failed = [h for h in llm_targets if h not in keyword_map]
+    if failed:
+        print(f"    ⚠️  AI 분석 실패 {len(failed)}개 → 로컬 추출기로 대체")
+        scores = local_extractor.score_candidates(targets)
+        for keywords in local_extractor.extract_keywords_by_headline(failed, scores=scores).values():
+            yield from keywords
+
+
 def main():
     print("=" * 60)
     print("🚀 블로그 키워드 분석 봇 시작")
@@ -12,36 +51,46 @@ def main():
     
     all_headlines = []
 
+    # 1~4. 뉴스 소스 동시 수집 (소스별 마감시간, 백업 소스 추측 실행)
+    print("\n[1-4/8] 뉴스 소스 동시 수집 중...")
+    metrics.stage("1-4 collect")
+    collected = crawler.collect_all_news()
+
     # 1. 네이버 뉴스 수집
-    print("\n[1/8] 네이버 랭킹 뉴스 수집 중...")
-    naver_news = crawler.fetch_naver_ranking_news()
+    print("\n[1/8] 네이버 랭킹 뉴스")
+    naver_news = collected.get("naver_ranking")
     if naver_news:
         all_headlines.extend(naver_news)
         print(f"    ✅ {len(naver_news)}개 수집 완료")
     else:
         print("    ⚠️  수집 실패")
 
-    # 2. 네이버 메인 (백업)
+    # 2. 네이버 메인 (백업) - 이미 동시에 수집해 둔 결과 사용
     if not naver_news:
-        print("\n[2/8] 네이버 메인 헤드라인 수집 중 (백업)...")
-        naver_main = crawler.fetch_naver_main_headlines()
+        print("\n[2/8] 네이버 메인 헤드라인 (백업)")
+        naver_main = collected.get("naver_main")
         if naver_main:
             all_headlines.extend(naver_main)
+            print(f"    ✅ {len(naver_main)}개 수집 완료")
 
     # 3. 정책브리핑 수집
-    print("\n[3/8] 정책브리핑 수집 중...")
-    policy_news = crawler.fetch_policy_api()
+    print("\n[3/8] 정책브리핑")
+    policy_news = collected.get("policy")
     if policy_news:
         all_headlines.extend(policy_news)
+        print(f"    ✅ {len(policy_news)}개 수집 완료")
 
     # 4. 다음 뉴스 수집
-    print("\n[4/8] 다음 뉴스 수집 중...")
-    daum_news = crawler.fetch_daum_news()
+    print("\n[4/8] 다음 뉴스")
+    daum_news = collected.get("daum")
     if daum_news:
         all_headlines.extend(daum_news)
+        print(f"    ✅ {len(daum_news)}개 수집 완료")
 
     # 5. 데이터 검증
     print("\n[5/8] 데이터 검증 중...")
+    metrics.stage("5 validate")
+    metrics.note("headlines", len(all_headlines))
     if not all_headlines:
         print("    ❌ 수집된 뉴스가 없습니다.")
         print("\n💡 해결 방법:")
@@ -52,37 +101,65 @@ def main():
     
     print(f"    ✅ 총 {len(all_headlines)}개 헤드라인 수집 완료")
     
-    # 중복 제거
-    all_headlines = list(set(all_headlines))
-    print(f"    🔄 중복 제거 후: {len(all_headlines)}개")
+    # 중복 제거 (같은 기사를 다룬 여러 언론사 헤드라인은 하나로)
+    all_headlines, dedupe_report = dedupe.cluster_headlines(all_headlines)
+    metrics.note("unique_headlines", len(all_headlines))
+    print(f"    🔄 중복 제거 후: {len(all_headlines)}개 "
+          f"(유사 기사 {dedupe_report['merged']}개 병합)")
+    print(f"    ✂️  프롬프트 토큰 약 {dedupe_report['tokens_saved']}개 절감 "
+          f"({dedupe_report['tokens_before']} → {dedupe_report['tokens_after']})")
 
     # 6. Claude AI 키워드 추출
     print("\n[6/8] Claude AI 키워드 추출 중...")
+    metrics.stage("6 keywords")
     print("    ⏳ AI 분석 중... (약 10-20초 소요)")
     
-    keywords = analyzer.analyze_headlines(all_headlines)
-    
-    if not keywords:
-        print("    ❌ 키워드 추출 실패")
-        return
-    
-    print(f"    ✅ {len(keywords)}개 키워드 추출 완료!")
+    # 헤드라인 저장소 기록 (증분 모드면 새 헤드라인만 AI 분석)
+    incremental = os.environ.get("INCREMENTAL_MODE") == "1"
+    store = HeadlineStore()
+    new_headlines, known = store.record(all_headlines)
+    print(f"    🆕 새 헤드라인 {len(new_headlines)}개 / 이전 분석 {len(known)}개")
+
+    targets = new_headlines if incremental else all_headlines
+    if incremental:
+        print(f"    ♻️  증분 모드: {len(known)}개 헤드라인은 저장된 키워드 재사용")
+    keyword_iter = generate_keywords(targets, known if incremental else {}, store)
 
-    # 7. 네이버 API로 키워드 분석
-    print("\n[7/8] 네이버 API 키워드 분석 중...")
     naver_api = NaverAPI()
-    keyword_results = naver_api.analyze_keywords(keywords)
+    if os.environ.get("STREAM_PIPELINE") == "1":
+        # 6→7 파이프라인: 키워드가 나오는 대로 네이버 검색량 조회 시작
+        print("\n[7/8] 네이버 API 키워드 분석 (AI 응답과 동시 진행)...")
+        metrics.stage("6-7 keywords+naver")
+        keyword_results = naver_api.analyze_keyword_stream(keyword_iter)
+        store.close()
+        metrics.note("keywords", naver_api.received_keywords)
+        if not naver_api.received_keywords:
+            print("    ❌ 키워드 추출 실패")
+            return
+    else:
+        keywords = analyzer.merge_keywords([keyword_iter])
+        store.close()
+        
+        metrics.note("keywords", len(keywords))
+        if not keywords:
+            print("    ❌ 키워드 추출 실패")
+            return
+        
+        print(f"    ✅ {len(keywords)}개 키워드 추출 완료!")
+
+        # 7. 네이버 API로 키워드 분석
+        print("\n[7/8] 네이버 API 키워드 분석 중...")
+        metrics.stage("7 naver")
+        keyword_results = naver_api.analyze_keywords(keywords)
     
-    # 상위 20개 키워드 연관검색어 조회
+    # 상위 20개 키워드 연관검색어 조회 (AUTOCOMPLETE_DEPTH로 더 깊이 확장)
+    metrics.note("analyzed_keywords", len(keyword_results))
+    metrics.stage("7 autocomplete")
     related_data = []
     if keyword_results:
         print("    🔍 연관검색어 조회 중... (상위 20개)")
-        for item in keyword_results[:20]:
-            related = naver_api.get_autocomplete(item['keyword'])
-            related_data.append({
-                'keyword': item['keyword'],
-                'related': related
-            })
+        related_data = autocomplete.expand([item['keyword'] for item in keyword_results[:20]])
+        autocomplete.print_stats()
         print(f"    ✅ 연관검색어 조회 완료")
     
     # 결과가 없어도 계속 진행
@@ -92,8 +169,18 @@ def main():
 
     # 8. HTML 파일 생성
     print("\n[8/8] HTML 리포트 생성 중...")
-    keyword_report = builder.build_keyword_report(keyword_results, related_data)
-    builder.build_html_file(keyword_report, keyword_results)
+    metrics.stage("8 build")
+    # 리포트는 조각 단위로 만들어 index.html에 바로 씀
+    keyword_report = builder.iter_keyword_report(keyword_results, related_data)
+    builder.build_html_file(keyword_report, keyword_results, related_data)
+
+    http_client.print_stats()
+    rate_limit.print_stats()
+    llm_cache.print_stats()
+    keyword_cache.print_stats()
+    assets.print_stats()
+    analyzer.print_attempt_stats()
+    metrics.stage("report")
     
     print("\n" + "=" * 60)
     print("✨ 모든 작업 완료!")
@@ -101,4 +188,9 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
-    main()
+    status = "error"
+    try:
+        main()
+        status = "ok"
+    finally:
+        metrics.write(status)
@@ -1,15 +1,101 @@
+import os
+import re
+import hashlib
+import queue
+import random
 import anthropic
+import openai
 import time
+from concurrent.futures import ThreadPoolExecutor
+from src import cassette, llm_cache
+from src.textutil import estimate_tokens
 
-def extract_keywords(headlines):
-    """Claude AI로 뉴스 헤드라인에서 블로그 키워드 추출"""
-    print("🧠 [Analyzer] 키워드 추출 시작...")
-    
-    client = anthropic.Anthropic()
-    
-    headlines_text = "\n".join([f"- {h}" for h in headlines])
-    
-    prompt = f"""다음 뉴스 헤드라인들을 분석하여 블로그 키워드를 추출해주세요.
+MODEL = "claude-sonnet-4-20250514"
+
+# 묶음 분할 기준: 입력 토큰 예산, 묶음당 최대 헤드라인 수, 동시 요청 수
+CHUNK_INPUT_TOKENS = int(os.environ.get("LLM_CHUNK_INPUT_TOKENS", "1500"))
+CHUNK_MAX_HEADLINES = int(os.environ.get("LLM_CHUNK_MAX_HEADLINES", "25"))
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", "4"))
+
+# 헤드라인당 응답 토큰 (번호 + 키워드 3개 + 여유)
+OUTPUT_TOKENS_PER_HEADLINE = 48
+MAX_OUTPUT_TOKENS = 4096
+
+# 재시도/전환 설정: 묶음당 전체 마감시간(초), 최대 시도 횟수, 백오프(초)
+LLM_DEADLINE = float(os.environ.get("LLM_DEADLINE_SECONDS", "90"))
+LLM_MAX_ATTEMPTS = int(os.environ.get("LLM_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE = 2
+BACKOFF_MAX = 30
+RETRY_STATUS = (429, 500, 502, 503, 504, 529)
+
+# 보조 제공자 (Claude가 마감시간 안에 응답하지 못할 때)
+FALLBACK_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+FALLBACK_TIMEOUT = 60
+
+# 시도별 기록 (제공자, 지연시간, 결과, 전환 사유)
+ATTEMPTS = []
+
+# "3. 키워드1, 키워드2" 형식의 응답 줄
+_LINE_PATTERN = re.compile(r"^\s*(\d+)\s*[.)]\s*(.+)$")
+
+
+def _request_keywords(prompt, max_tokens=1024, timeout=None):
+    """Claude 호출 -> (응답 텍스트, stop_reason) (카세트 녹화/재생 지원)"""
+    def send():
+        # 재시도는 _extract_chunk에서 마감시간 기준으로 직접 처리
+        client = anthropic.Anthropic(max_retries=0, timeout=timeout or 600)
+        response = client.messages.create(
+            model=MODEL,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return {"text": response.content[0].text, "stop_reason": response.stop_reason}
+
+    tape = cassette.get()
+    if tape:
+        result = tape.call("anthropic", {"model": MODEL, "max_tokens": max_tokens, "prompt": prompt}, send)
+    else:
+        result = send()
+    return _unpack_result(result)
+
+
+def _request_keywords_openai(prompt, max_tokens=1024):
+    """보조 제공자(OpenAI) 호출 -> (응답 텍스트, stop_reason)"""
+    def send():
+        client = openai.OpenAI(max_retries=0, timeout=FALLBACK_TIMEOUT)
+        response = client.chat.completions.create(
+            model=FALLBACK_MODEL,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        choice = response.choices[0]
+        # OpenAI는 한도에서 잘리면 finish_reason이 "length"
+        stop_reason = "max_tokens" if choice.finish_reason == "length" else choice.finish_reason
+        return {"text": choice.message.content, "stop_reason": stop_reason}
+
+    tape = cassette.get()
+    if tape:
+        result = tape.call("openai", {"model": FALLBACK_MODEL, "max_tokens": max_tokens, "prompt": prompt}, send)
+    else:
+        result = send()
+    return _unpack_result(result)
+
+
+def _unpack_result(result):
+    """호출 결과 -> (텍스트, stop_reason) (stop_reason 기록 전 카세트는 텍스트만 있음)"""
+    if isinstance(result, str):
+        return result, None
+    return result["text"], result.get("stop_reason")
+
+
+def _build_prompt(headlines):
+    headlines_text = "\n".join([f"{idx}. {h}" for idx, h in enumerate(headlines, 1)])
+
+    return f"""다음 뉴스 헤드라인들을 분석하여 블로그 키워드를 추출해주세요.
 
 뉴스 헤드라인:
 {headlines_text}
@@ -19,42 +105,429 @@ def extract_keywords(headlines):
 2. 띄어쓰기 없이 붙여서 작성 (예: "삼성전자주가", "비트코인전망")
 3. 너무 일반적인 단어 제외 (뉴스, 오늘, 발표 등)
 4. 검색량이 있을 것 같은 구체적인 키워드 선정
-5. 키워드만 쉼표로 구분하여 나열 (설명 없이)
+5. 헤드라인 번호별로 한 줄씩, 키워드만 쉼표로 구분하여 나열 (설명 없이)
 
 응답 형식:
-키워드1, 키워드2, 키워드3, ...
+1. 키워드1, 키워드2, 키워드3
+2. 키워드1, 키워드2
+...
 """
-    
-    max_retries = 3
-    for attempt in range(max_retries):
+
+
+# 프롬프트 문구가 바뀌면 캐시 키도 자동으로 바뀐다
+PROMPT_VERSION = hashlib.sha256(_build_prompt(["{headline}"]).encode()).hexdigest()[:12]
+
+
+def _split_keywords(text):
+    keywords = [kw.strip().replace(" ", "") for kw in text.split(",")]
+    return [kw for kw in keywords if len(kw) >= 2]
+
+
+def _parse_response(result, headlines):
+    """번호별 응답을 {헤드라인: [키워드]}로 변환 (번호 없는 줄은 None 키로)"""
+    mapping = {}
+    for line in result.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if match:
+            number, text = int(match.group(1)), match.group(2)
+            headline = headlines[number - 1] if 1 <= number <= len(headlines) else None
+            mapping.setdefault(headline, []).extend(_split_keywords(text))
+        elif line.strip():
+            mapping.setdefault(None, []).extend(_split_keywords(line))
+    return mapping
+
+
+def merge_keywords(keyword_lists):
+    """여러 키워드 목록을 순서를 유지하며 합치고 중복 제거"""
+    merged = []
+    for keywords in keyword_lists:
+        merged.extend(keywords)
+    return list(dict.fromkeys(merged))
+
+
+def extract_keywords_by_headline(headlines):
+    """Claude AI로 헤드라인별 블로그 키워드 추출 -> {헤드라인: [키워드]}
+
+    실패한 묶음의 헤드라인은 결과에 포함되지 않는다.
+    """
+    print("🧠 [Analyzer] 키워드 추출 시작...")
+
+    if not headlines:
+        return {}
+
+    if cassette.active():
+        # 녹화/재생 중에는 캐시 상태와 무관하게 같은 프롬프트를 보낸다
+        return _extract_uncached(headlines)
+
+    cache = llm_cache.get_cache()
+    cached, missing = cache.lookup(headlines, MODEL, PROMPT_VERSION)
+    if cached:
+        print(f"♻️  [Analyzer] 캐시 적중 {len(cached)}개, AI 분석 대상 {len(missing)}개")
+    if not missing:
+        return cached
+
+    mapping = _extract_uncached(missing)
+    if mapping:
+        cache.store(mapping, MODEL, PROMPT_VERSION)
+    return {**cached, **mapping}
+
+
+def chunk_headlines(headlines, max_tokens=CHUNK_INPUT_TOKENS, max_items=CHUNK_MAX_HEADLINES):
+    """헤드라인을 입력 토큰 예산 안에서 묶음으로 나눔"""
+    chunks = []
+    current, current_tokens = [], 0
+    for headline in headlines:
+        tokens = estimate_tokens(f"{len(current) + 1}. {headline}\n")
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(headline)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def output_budget(chunk):
+    """묶음 크기에 맞춘 응답 토큰 한도 (잘리지 않도록 여유 있게)"""
+    return min(MAX_OUTPUT_TOKENS, 256 + OUTPUT_TOKENS_PER_HEADLINE * len(chunk))
+
+
+def _extract_uncached(headlines):
+    """캐시에 없는 헤드라인을 묶음으로 나눠 Claude에 동시 요청 후 병합"""
+    chunks = chunk_headlines(headlines)
+    if len(chunks) == 1:
+        return _extract_chunk(chunks[0])
+
+    print(f"🧩 [Analyzer] {len(headlines)}개 헤드라인을 {len(chunks)}개 묶음으로 동시 분석 "
+          f"(동시 요청 {min(LLM_CONCURRENCY, len(chunks))}개)")
+    merged = {}
+    with ThreadPoolExecutor(max_workers=min(LLM_CONCURRENCY, len(chunks))) as executor:
+        for mapping in executor.map(_extract_chunk, chunks):
+            for headline, keywords in mapping.items():
+                merged.setdefault(headline, []).extend(keywords)
+    return {h: list(dict.fromkeys(kws)) for h, kws in merged.items()}
+
+
+def _retry_after(error):
+    """429/529 응답의 Retry-After 헤더 (초)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(error):
+    if isinstance(error, (anthropic.APIConnectionError, anthropic.APITimeoutError)):
+        return True
+    status = getattr(error, "status_code", None)
+    return status in RETRY_STATUS or "overloaded" in str(error).lower()
+
+
+def _record_attempt(provider, attempt, headlines, start, outcome, **extra):
+    ATTEMPTS.append({
+        "provider": provider,
+        "attempt": attempt,
+        "headlines": len(headlines),
+        "latency_ms": round((time.monotonic() - start) * 1000),
+        "outcome": outcome,
+        **extra,
+    })
+
+
+def _complete_mapping(result, headlines):
+    mapping = _parse_response(result, headlines)
+    # 응답에서 빠진 헤드라인도 빈 결과로 채워 분석 완료로 표시
+    for headline in headlines:
+        mapping.setdefault(headline, [])
+    return mapping
+
+
+def _extract_chunk(headlines, max_tokens=None):
+    """헤드라인 묶음 하나를 분석 (마감시간 안에서 재시도, 넘으면 보조 모델로 전환)
+
+    응답이 토큰 한도에서 잘리면 마지막 키워드가 덜 쓰였을 수 있으므로 버리고,
+    한도를 두 배로 늘려 다시 요청한다. 이미 최대 한도면 묶음을 반으로 나눈다.
+    """
+    prompt = _build_prompt(headlines)
+    max_tokens = max_tokens or output_budget(headlines)
+    deadline = time.monotonic() + LLM_DEADLINE
+    failover_reason = None
+
+    for attempt in range(1, LLM_MAX_ATTEMPTS + 1):
+        start = time.monotonic()
+        remaining = deadline - start
+        if remaining <= 0:
+            failover_reason = "마감시간 초과"
+            break
         try:
-            response = client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=1024,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            result = response.content[0].text
-            keywords = [kw.strip().replace(" ", "") for kw in result.split(",")]
-            keywords = [kw for kw in keywords if len(kw) >= 2]
-            keywords = list(dict.fromkeys(keywords))
+            result, stop_reason = _request_keywords(prompt, max_tokens=max_tokens, timeout=remaining)
+            if stop_reason == "max_tokens":
+                _record_attempt("anthropic", attempt, headlines, start, "truncated")
+                if max_tokens >= MAX_OUTPUT_TOKENS:
+                    return _extract_split(headlines)
+                max_tokens = min(MAX_OUTPUT_TOKENS, max_tokens * 2)
+                print(f"✂️  [Analyzer] 응답이 잘려 토큰 한도 {max_tokens}로 다시 요청 ({attempt}/{LLM_MAX_ATTEMPTS})")
+                continue
+            _record_attempt("anthropic", attempt, headlines, start, "ok")
+            mapping = _complete_mapping(result, headlines)
             
-            print(f"✅ [Analyzer] {len(keywords)}개 키워드 추출 완료")
-            return keywords
+            count = len(merge_keywords(mapping.values()))
+            print(f"✅ [Analyzer] {count}개 키워드 추출 완료")
+            return mapping
             
+        except cassette.CassetteMiss as e:
+            # 재생 모드에서 녹화되지 않은 요청: 재시도해도 같으므로 바로 실패 처리
+            _record_attempt("anthropic", attempt, headlines, start, "error", error=str(e)[:200])
+            print(f"❌ [Analyzer] {e}")
+            failover_reason = "카세트에 없는 요청"
+            break
         except anthropic.APIError as e:
-            if "overloaded" in str(e).lower() or "529" in str(e):
-                wait_time = (attempt + 1) * 30  # 30초, 60초, 90초
-                print(f"⏳ [Analyzer] API 과부하, {wait_time}초 후 재시도... ({attempt + 1}/{max_retries})")
-                time.sleep(wait_time)
-            else:
+            _record_attempt("anthropic", attempt, headlines, start, "error", error=str(e)[:200])
+            if not _is_retryable(e):
                 print(f"❌ [Analyzer] 에러: {e}")
-                return []
-    
-    print("❌ [Analyzer] 최대 재시도 횟수 초과")
-    return []
+                failover_reason = f"재시도 불가 에러: {getattr(e, 'status_code', type(e).__name__)}"
+                break
+
+            # 지수 백오프 + 지터, Retry-After가 있으면 그 값을 따름
+            wait_time = random.uniform(0.5, 1.0) * min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1))
+            retry_after = _retry_after(e)
+            if retry_after is not None:
+                wait_time = retry_after
+            if time.monotonic() + wait_time >= deadline:
+                failover_reason = f"재시도 대기({wait_time:.0f}초)가 마감시간 초과"
+                break
+            print(f"⏳ [Analyzer] API 과부하, {wait_time:.1f}초 후 재시도... ({attempt}/{LLM_MAX_ATTEMPTS})")
+            time.sleep(wait_time)
+    else:
+        failover_reason = "최대 재시도 횟수 초과"
+
+    print(f"🔀 [Analyzer] 보조 모델로 전환: {failover_reason}")
+    return _extract_chunk_fallback(prompt, headlines, max_tokens, failover_reason)
+
+
+def _extract_split(headlines):
+    """최대 한도로도 잘리는 묶음을 반으로 나눠 각각 분석"""
+    if len(headlines) < 2:
+        print("❌ [Analyzer] 헤드라인 하나의 응답도 토큰 한도를 넘어 결과를 버립니다")
+        return {}
+    half = len(headlines) // 2
+    print(f"✂️  [Analyzer] 응답이 최대 한도에서도 잘려 {len(headlines)}개 묶음을 둘로 나눠 다시 요청")
+    mapping = _extract_chunk(headlines[:half])
+    mapping.update(_extract_chunk(headlines[half:]))
+    return mapping
+
+
+def _extract_chunk_fallback(prompt, headlines, max_tokens, reason):
+    """보조 제공자(OpenAI)로 한 번 분석"""
+    if not os.environ.get("OPENAI_API_KEY") and not cassette.is_replay():
+        print("❌ [Analyzer] 보조 모델 키가 없습니다 (OPENAI_API_KEY)")
+        _record_attempt("openai", 0, headlines, time.monotonic(), "skipped", failover_reason=reason)
+        return {}
+
+    start = time.monotonic()
+    try:
+        result, stop_reason = _request_keywords_openai(prompt, max_tokens=max_tokens)
+    except (openai.OpenAIError, cassette.CassetteMiss) as e:
+        print(f"❌ [Analyzer] 보조 모델 에러: {e}")
+        _record_attempt("openai", 1, headlines, start, "error", error=str(e)[:200], failover_reason=reason)
+        return {}
+    if stop_reason == "max_tokens":
+        # 잘린 응답은 쓰지 않고 로컬 추출기에 맡김
+        print("❌ [Analyzer] 보조 모델 응답이 토큰 한도에서 잘렸습니다")
+        _record_attempt("openai", 1, headlines, start, "truncated", failover_reason=reason)
+        return {}
+
+    _record_attempt("openai", 1, headlines, start, "ok", failover_reason=reason)
+    mapping = _complete_mapping(result, headlines)
+    print(f"✅ [Analyzer] 보조 모델로 {len(merge_keywords(mapping.values()))}개 키워드 추출 완료")
+    return mapping
+
+
+def print_attempt_stats():
+    """LLM 호출 시도별 지연시간과 전환 사유 요약"""
+    if not ATTEMPTS:
+        return
+    for provider in ("anthropic", "openai"):
+        rows = [a for a in ATTEMPTS if a["provider"] == provider]
+        if not rows:
+            continue
+        ok = sum(1 for a in rows if a["outcome"] == "ok")
+        latency = sum(a["latency_ms"] for a in rows) / len(rows)
+        print(f"    🤖 [LLM] {provider}: 시도 {len(rows)}회, 성공 {ok}회, 평균 {latency:.0f}ms")
+    for reason in {a["failover_reason"] for a in ATTEMPTS if a.get("failover_reason")}:
+        print(f"       - 보조 모델 전환 사유: {reason}")
+
+
+class _StreamParser:
+    """스트리밍 응답 조각에서 완성된 키워드를 골라냄
+
+    "3. 키워드1, 키워드2" 줄에서 쉼표나 줄바꿈을 만나면 그 앞의 키워드가
+    완성된 것으로 본다.
+    """
+
+    def __init__(self, headlines):
+        self.headlines = headlines
+        self.mapping = {}
+        self._buffer = ""
+        self._emitted_in_line = 0
+
+    def feed(self, text):
+        self._buffer += text
+        completed = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            completed += self._emit(line, final=True)
+            self._emitted_in_line = 0
+        completed += self._emit(self._buffer, final=False)
+        return completed
+
+    def close(self):
+        completed = self._emit(self._buffer, final=True)
+        self._buffer = ""
+        return completed
+
+    def _emit(self, line, final):
+        match = _LINE_PATTERN.match(line)
+        if match:
+            number, text = int(match.group(1)), match.group(2)
+            headline = self.headlines[number - 1] if 1 <= number <= len(self.headlines) else None
+        elif final and line.strip():
+            headline, text = None, line
+        else:
+            return []
+
+        parts = text.split(",")
+        complete = parts if final else parts[:-1]
+        new_parts = complete[self._emitted_in_line:]
+        self._emitted_in_line = len(complete)
+
+        completed = []
+        for part in new_parts:
+            for keyword in _split_keywords(part):
+                self.mapping.setdefault(headline, []).append(keyword)
+                completed.append((headline, keyword))
+        return completed
+
+
+def _stream_chunk(headlines, out):
+    """묶음 하나를 스트리밍으로 분석하며 완성된 (헤드라인, 키워드)를 큐에 넣음"""
+    parser = _StreamParser(headlines)
+    max_tokens = output_budget(headlines)
+    start = time.monotonic()
+    try:
+        client = anthropic.Anthropic(max_retries=0, timeout=LLM_DEADLINE)
+        with client.messages.stream(
+            model=MODEL,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "user", "content": _build_prompt(headlines)}
+            ]
+        ) as stream:
+            for text in stream.text_stream:
+                for item in parser.feed(text):
+                    out.put(item)
+            stop_reason = stream.get_final_message().stop_reason
+    except anthropic.APIError as e:
+        _record_attempt("anthropic", 1, headlines, start, "error", error=str(e)[:200], stream=True)
+        print(f"⚠️  [Analyzer] 스트리밍 실패, 일반 요청으로 재시도: {e}")
+        return _retry_stream(headlines, parser, out)
+
+    if stop_reason == "max_tokens":
+        # 남은 버퍼는 덜 쓰인 키워드라 내보내지 않고, 한도를 늘린 일반 요청으로 다시 받음
+        _record_attempt("anthropic", 1, headlines, start, "truncated", stream=True)
+        print("✂️  [Analyzer] 스트리밍 응답이 토큰 한도에서 잘려 일반 요청으로 재시도")
+        return _retry_stream(headlines, parser, out, min(MAX_OUTPUT_TOKENS, max_tokens * 2))
+    for item in parser.close():
+        out.put(item)
+
+    _record_attempt("anthropic", 1, headlines, start, "ok", stream=True)
+    mapping = parser.mapping
+    for headline in headlines:
+        mapping.setdefault(headline, [])
+    print(f"✅ [Analyzer] 스트리밍으로 {len(merge_keywords(mapping.values()))}개 키워드 추출 완료")
+    return mapping
+
+
+def _retry_stream(headlines, parser, out, max_tokens=None):
+    """스트리밍이 실패한 묶음을 일반 요청으로 다시 분석 (이미 내보낸 키워드는 다시 보내지 않음)"""
+    mapping = _extract_chunk(headlines, max_tokens)
+    for headline, keywords in mapping.items():
+        already = set(parser.mapping.get(headline, []))
+        for keyword in keywords:
+            if keyword not in already:
+                out.put((headline, keyword))
+    return mapping
+
+
+def stream_keywords_by_headline(headlines, collected=None):
+    """키워드가 완성되는 대로 (헤드라인, 키워드)를 내보내는 생성기
+
+    캐시 적중분을 먼저 내보내고, 나머지는 묶음별 스트리밍 요청으로 받는다.
+    collected에는 분석에 성공한 {헤드라인: [키워드]}를 채운다.
+    """
+    collected = {} if collected is None else collected
+    if not headlines:
+        return
+
+    if cassette.active():
+        # 녹화/재생은 일반 요청 단위로 저장되므로 스트리밍 대신 묶음 결과를 내보냄
+        mapping = extract_keywords_by_headline(headlines)
+        collected.update(mapping)
+        for headline, keywords in mapping.items():
+            for keyword in keywords:
+                yield headline, keyword
+        return
+
+    print("🧠 [Analyzer] 스트리밍 키워드 추출 시작...")
+    cache = llm_cache.get_cache()
+    cached, missing = cache.lookup(headlines, MODEL, PROMPT_VERSION)
+    collected.update(cached)
+    for headline, keywords in cached.items():
+        for keyword in keywords:
+            yield headline, keyword
+    if not missing:
+        return
+
+    chunks = chunk_headlines(missing)
+    out = queue.Queue()
+    done = object()
+
+    def run(chunk):
+        try:
+            return _stream_chunk(chunk, out)
+        finally:
+            out.put(done)
+
+    executor = ThreadPoolExecutor(max_workers=min(LLM_CONCURRENCY, len(chunks)))
+    futures = [executor.submit(run, chunk) for chunk in chunks]
+    finished = 0
+    while finished < len(chunks):
+        item = out.get()
+        if item is done:
+            finished += 1
+            continue
+        yield item
+    executor.shutdown()
+
+    mapping = {}
+    for future in futures:
+        if future.exception():
+            print(f"❌ [Analyzer] 에러: {future.exception()}")
+            continue
+        mapping.update(future.result())
+    if mapping:
+        cache.store(mapping, MODEL, PROMPT_VERSION)
+    collected.update(mapping)
+
+
+def extract_keywords(headlines):
+    """Claude AI로 뉴스 헤드라인에서 블로그 키워드 추출"""
+    mapping = extract_keywords_by_headline(headlines)
+    return merge_keywords(mapping.values())
 
 
 # 함수 별칭 (main.py 호환성)
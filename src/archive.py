@@ -0,0 +1,113 @@
+"""아카이브 목록 (manifest)과 실행 결과 스냅샷 (.json.gz)
+
+output/archive/manifest/0001.jsonl처럼 PAGE_SIZE개씩 나눈 JSON Lines 파일에
+실행마다 한 줄씩 추가한다. 마지막 페이지 파일만 읽고 쓰므로 아카이브가
+늘어나도 실행 비용은 일정하다.
+"""
+import os
+import json
+import gzip
+from datetime import datetime
+
+MANIFEST_DIR = "output/archive/manifest"
+PAGE_SIZE = 50
+
+
+def parse_filename(filename):
+    """'2026-01-02_13-04_키워드1_키워드2.html' -> 목록 항목"""
+    stem = filename.split('.')[0]
+    parts = stem.split('_')
+    entry = {"file": filename, "run_at": None, "keywords": []}
+    if len(parts) >= 2:
+        try:
+            entry["run_at"] = datetime.strptime(f"{parts[0]} {parts[1]}", "%Y-%m-%d %H-%M").isoformat()
+        except ValueError:
+            pass
+        entry["keywords"] = [kw for kw in parts[2:] if kw != "분석결과"]
+    return entry
+
+
+def write_snapshot(path, data):
+    """실행 결과를 압축 JSON으로 저장 (mtime=0으로 내용이 같으면 파일도 같게)"""
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=9, mtime=0) as gz:
+            gz.write(raw)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def read_snapshot(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ArchiveManifest:
+    """페이지 단위 JSON Lines 아카이브 목록 (오래된 항목부터 1페이지)"""
+
+    def __init__(self, manifest_dir=MANIFEST_DIR, page_size=PAGE_SIZE):
+        self.manifest_dir = manifest_dir
+        self.page_size = page_size
+
+    def exists(self):
+        return os.path.isdir(self.manifest_dir)
+
+    def _page_path(self, page):
+        return os.path.join(self.manifest_dir, f"{page:04d}.jsonl")
+
+    def page_count(self):
+        """페이지 파일 수 (디렉터리 목록만 보며, 항목을 읽지 않음)"""
+        if not self.exists():
+            return 0
+        return sum(1 for name in os.listdir(self.manifest_dir) if name.endswith(".jsonl"))
+
+    def read_page(self, page):
+        """page번째 페이지 항목 (오래된 순)"""
+        path = self._page_path(page)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def count(self):
+        pages = self.page_count()
+        if not pages:
+            return 0
+        return (pages - 1) * self.page_size + len(self.read_page(pages))
+
+    def append(self, entry):
+        """항목 추가 -> 이번 추가로 가득 찬 페이지 번호 (없으면 None)"""
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        page = max(self.page_count(), 1)
+        entries = self.read_page(page)
+        if entries and entries[-1]["file"] == entry["file"]:
+            # 같은 분에 다시 실행해서 같은 파일을 덮어쓴 경우
+            return None
+        if len(entries) >= self.page_size:
+            page += 1
+            entries = []
+        with open(self._page_path(page), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return page if len(entries) + 1 == self.page_size else None
+
+    def latest(self, limit):
+        """최근 항목 limit개 (최신 순) - 마지막 페이지와 그 앞 페이지만 읽음"""
+        pages = self.page_count()
+        entries = []
+        for page in range(pages, 0, -1):
+            entries = self.read_page(page) + entries
+            if len(entries) >= limit:
+                break
+        return list(reversed(entries))[:limit]
+
+    def migrate(self, archive_dir):
+        """manifest 도입 전 아카이브 파일로 목록을 한 번 생성 -> 가득 찬 페이지 번호 목록"""
+        files = sorted(f for f in os.listdir(archive_dir) if f.endswith('.html'))
+        full_pages = []
+        for filename in files:
+            page = self.append(parse_filename(filename))
+            if page:
+                full_pages.append(page)
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        return full_pages
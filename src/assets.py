@@ -0,0 +1,108 @@
+"""정적 출력물 묶음 (내용 해시 스타일시트, 미리 압축한 .gz/.br 사본, 생성 HTML 공백 정리)
+
+레이아웃과 아카이브 페이지의 CSS를 output/static/style.<해시>.css 하나로 모아
+HTML에서는 링크만 건다. 내용이 바뀌면 파일 이름도 바뀌므로 호스팅에서 오래
+캐시해도 된다. brotli 패키지가 없으면 .br 없이 .gz만 만든다.
+"""
+import os
+import re
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = "output/static"
+
+_STYLE_BLOCK = re.compile(r"<style>(.*?)</style>", re.S)
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s*([{};,>])\s*|(?<=:)\s+")
+_TAG_GAP = re.compile(r">\s+<")
+
+_stats = {"compressed": 0, "raw_bytes": 0, "gz_bytes": 0, "br_bytes": 0}
+
+
+def split_style(text, placeholder="{{stylesheet}}"):
+    """HTML의 첫 <style> 블록을 플레이스홀더로 바꿈 -> (HTML, CSS)"""
+    match = _STYLE_BLOCK.search(text)
+    if not match:
+        return text, ""
+    return text[:match.start()] + placeholder + text[match.end():], match.group(1)
+
+
+def minify_css(css):
+    """주석과 불필요한 공백 제거 (값 안의 공백은 하나로 유지)"""
+    css = _CSS_COMMENT.sub("", css)
+    css = " ".join(css.split())
+    css = _CSS_SPACE.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_html(html):
+    """생성한 표/목록 조각의 태그 사이 들여쓰기 제거 (<script>가 없는 조각에만 사용)"""
+    return _TAG_GAP.sub("><", html).strip()
+
+
+def write_stylesheet(css, static_dir=STATIC_DIR):
+    """CSS를 내용 해시 파일로 저장 -> output/ 기준 경로 (static/style.<해시>.css)
+
+    이전 해시 파일은 지우지 않는다. 한 번만 렌더링하는 아카이브 페이지가
+    계속 참조하기 때문이다.
+    """
+    data = minify_css(css).encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    filename = f"style.{digest}.css"
+    path = os.path.join(static_dir, filename)
+    if not os.path.exists(path):
+        os.makedirs(static_dir, exist_ok=True)
+        _write_bytes(path, data)
+        precompress(path)
+    return f"{os.path.basename(static_dir)}/{filename}"
+
+
+def stylesheet_link(href):
+    return f'<link rel="stylesheet" href="{href}">'
+
+
+def precompress(path):
+    """path.gz / path.br 사본 생성 (brotli가 없으면 예전 .br은 지워서 내용이 어긋나지 않게)"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    gz_data = gzip.compress(data, compresslevel=9, mtime=0)
+    _write_bytes(path + ".gz", gz_data)
+    _stats["compressed"] += 1
+    _stats["raw_bytes"] += len(data)
+    _stats["gz_bytes"] += len(gz_data)
+
+    if brotli is not None:
+        br_data = brotli.compress(data, quality=11)
+        _write_bytes(path + ".br", br_data)
+        _stats["br_bytes"] += len(br_data)
+    elif os.path.exists(path + ".br"):
+        os.remove(path + ".br")
+
+
+def _write_bytes(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def stats():
+    return dict(_stats, brotli=brotli is not None)
+
+
+def print_stats():
+    if not _stats["compressed"]:
+        return
+    line = (f"    🗜️  [Assets] 미리 압축 {_stats['compressed']}개: "
+            f"{_stats['raw_bytes'] / 1024:.1f}KB -> gz {_stats['gz_bytes'] / 1024:.1f}KB")
+    if brotli is not None:
+        line += f", br {_stats['br_bytes'] / 1024:.1f}KB"
+    else:
+        line += " (brotli 미설치로 .br 생략)"
+    print(line)
@@ -0,0 +1,148 @@
+"""네이버 자동완성 기반 연관검색어 확장
+
+AUTOCOMPLETE_DEPTH        : 확장 깊이 (1 = 시드 키워드의 자동완성만, 2 = 그 제안의 자동완성까지 ...)
+AUTOCOMPLETE_WIDTH        : 키워드마다 다음 단계로 넘길 제안 수
+AUTOCOMPLETE_CONCURRENCY  : 동시 요청 수
+AUTOCOMPLETE_MAX_REQUESTS : 실제 HTTP 요청 상한 (캐시 적중은 제외)
+AUTOCOMPLETE_TIME_BUDGET  : 전체 확장 시간 상한(초)
+"""
+import os
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from src import http_client, keyword_cache
+
+AC_URL = "https://mac.search.naver.com/mobile/ac"
+
+DEPTH = int(os.environ.get("AUTOCOMPLETE_DEPTH", "1"))
+WIDTH = int(os.environ.get("AUTOCOMPLETE_WIDTH", "5"))
+CONCURRENCY = int(os.environ.get("AUTOCOMPLETE_CONCURRENCY", "8"))
+MAX_REQUESTS = int(os.environ.get("AUTOCOMPLETE_MAX_REQUESTS", "200"))
+TIME_BUDGET = float(os.environ.get("AUTOCOMPLETE_TIME_BUDGET", "10"))
+
+# 최근 확장 지표
+STATS = {}
+
+
+def fetch_suggestions(keyword, timeout=5):
+    """자동완성 제안 조회 (자기 자신 제외, 실패하면 None)"""
+    params = {
+        "q": keyword,
+        "st": "1",
+        "r_format": "json",
+        "r_enc": "UTF-8",
+        "r_unicode": "0",
+        "t_koreng": "1"
+    }
+    try:
+        response = http_client.get(AC_URL, params=params, timeout=timeout)
+        if response.status_code != 200:
+            return None
+        items = response.json().get("items", [[]])[0]
+        return [item[0] for item in items if item and item[0] != keyword]
+    except (requests.RequestException, ValueError, IndexError, TypeError):
+        return None
+
+
+def suggest(keyword):
+    """캐시를 거친 자동완성 제안 목록 (실패하면 빈 목록)"""
+    cache = keyword_cache.get_cache()
+    cached = cache.get("autocomplete", keyword)
+    if cached is not None:
+        return cached
+    suggestions = fetch_suggestions(keyword)
+    if suggestions is None:
+        return []
+    cache.put("autocomplete", keyword, suggestions)
+    return suggestions
+
+
+def expand(seeds, depth=DEPTH, width=WIDTH, max_requests=MAX_REQUESTS,
+           time_budget=TIME_BUDGET, concurrency=CONCURRENCY):
+    """시드 키워드에서 자동완성 그래프를 너비 우선으로 확장
+
+    단계마다 같은 깊이의 키워드를 동시에 조회하고, 이미 방문한 키워드는
+    다시 조회하지 않는다. 요청 수나 시간 상한에 닿으면 그때까지의 결과만 쓴다.
+
+    -> [{"keyword": 시드, "related": 시드의 자동완성 상위 width개,
+         "expanded": 더 깊은 단계에서 새로 발견한 키워드}]
+    """
+    start = time.monotonic()
+    cache = keyword_cache.get_cache()
+    results = {seed: {"keyword": seed, "related": [], "expanded": []} for seed in seeds}
+    visited = set(results)
+    frontier = [(seed, seed) for seed in results]  # (조회할 키워드, 시드)
+    stats = {"requests": 0, "cache_hits": 0, "failed": 0, "nodes": 0, "depth": 0, "stopped": None}
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        for level in range(1, depth + 1):
+            if not frontier:
+                break
+            remaining = time_budget - (time.monotonic() - start)
+            if remaining <= 0:
+                stats["stopped"] = "time"
+                break
+
+            keywords = list(dict.fromkeys(kw for kw, _ in frontier))
+            suggestions, missing = cache.get_many("autocomplete", keywords)
+            stats["cache_hits"] += len(suggestions)
+
+            budget = max(0, max_requests - stats["requests"])
+            if len(missing) > budget:
+                stats["stopped"] = "requests"
+                missing = missing[:budget]
+            stats["requests"] += len(missing)
+
+            futures = {executor.submit(fetch_suggestions, kw): kw for kw in missing}
+            done, not_done = wait(futures, timeout=remaining)
+            if not_done:
+                stats["stopped"] = "time"
+            fetched = {}
+            for future in done:
+                found = future.result()
+                if found is None:
+                    stats["failed"] += 1
+                else:
+                    fetched[futures[future]] = found
+            cache.put_many("autocomplete", fetched)
+            suggestions.update(fetched)
+
+            next_frontier = []
+            for keyword, seed in frontier:
+                if keyword not in suggestions:
+                    continue
+                stats["nodes"] += 1
+                top = suggestions[keyword][:width]
+                if level == 1:
+                    results[seed]["related"] = top
+                for suggestion in top:
+                    if suggestion in visited:
+                        continue
+                    visited.add(suggestion)
+                    if level > 1:
+                        results[seed]["expanded"].append(suggestion)
+                    next_frontier.append((suggestion, seed))
+            frontier = next_frontier
+            stats["depth"] = level
+
+            if stats["stopped"]:
+                break
+    finally:
+        # 시간 상한을 넘긴 요청은 기다리지 않는다
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    stats["elapsed"] = round(time.monotonic() - start, 2)
+    stats["keywords"] = len(visited) - len(results)
+    STATS.clear()
+    STATS.update(stats)
+    return list(results.values())
+
+
+def print_stats():
+    if not STATS:
+        return
+    stopped = {"time": " (시간 상한 도달)", "requests": " (요청 상한 도달)"}.get(STATS["stopped"], "")
+    print(f"    🔗 [Autocomplete] 깊이 {STATS['depth']}, 연관검색어 {STATS['keywords']}개, "
+          f"요청 {STATS['requests']}회 / 캐시 {STATS['cache_hits']}회 / 실패 {STATS['failed']}회, "
+          f"{STATS['elapsed']}초{stopped}")
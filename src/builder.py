@@ -1,101 +1,102 @@
 import os
+import re
+import json
 from datetime import datetime, timezone, timedelta
-import shutil
+from src import template, archive, assets, search_index
 
-def build_keyword_report(keyword_results, related_data=None):
+# 리포트 표에 보여줄 최대 키워드 수 / 포화도 기준
+REPORT_LIMIT = 50
+MAX_SATURATION = 1.5
+
+LAYOUT_PATH = "templates/layout.html"
+ARCHIVE_CSS_PATH = "templates/archive.css"
+
+def build_keyword_report(keyword_results, related_data=None, limit=REPORT_LIMIT):
     """키워드 분석 결과를 HTML 테이블로 변환"""
+    return "".join(iter_keyword_report(keyword_results, related_data, limit))
+
+
+def iter_keyword_report(keyword_results, related_data=None, limit=REPORT_LIMIT):
+    """키워드 리포트 HTML을 조각 단위로 생성 (limit=None이면 전체 행)
+
+    행이 많을 수 있어 태그 사이 공백 없이 바로 만든다 (나중에 공백을 정리하지 않음).
+    """
     
     if not keyword_results:
-        return "<p>분석된 키워드가 없습니다.</p>"
+        yield "<p>분석된 키워드가 없습니다.</p>"
+        return
     
     # 포화도 1.5 이하만 선택
-    top_keywords = [r for r in keyword_results if r["saturation"] <= 1.5][:50]
+    top_keywords = [r for r in keyword_results if r["saturation"] <= MAX_SATURATION][:limit]
     
-    html = """
-    <div class="keyword-report">
-        <h3>📊 상위노출 가능 키워드 TOP 50</h3>
-        <p class="update-info">포화도 = 블로그문서수 ÷ 월간검색량 (낮을수록 상위노출 쉬움)</p>
-        
-        <table class="keyword-table">
-            <thead>
-                <tr>
-                    <th>순위</th>
-                    <th>키워드</th>
-                    <th>월간검색량</th>
-                    <th>블로그문서수</th>
-                    <th>포화도</th>
-                    <th>상위노출</th>
-                    <th>분석</th>
-                </tr>
-            </thead>
-            <tbody>
-    """
+    yield (
+        '<div class="keyword-report">'
+        f'<h3>📊 상위노출 가능 키워드 TOP {limit or len(top_keywords)}</h3>'
+        '<p class="update-info">포화도 = 블로그문서수 ÷ 월간검색량 (낮을수록 상위노출 쉬움)</p>'
+        '<table class="keyword-table"><thead><tr>'
+        '<th>순위</th><th>키워드</th><th>월간검색량</th><th>블로그문서수</th>'
+        '<th>포화도</th><th>상위노출</th><th>분석</th>'
+        '</tr></thead><tbody>'
+    )
     
     for idx, item in enumerate(top_keywords, 1):
         keyword = item['keyword']
         naver_url = f"https://search.naver.com/search.naver?query={keyword}"
-        html += f"""
-                <tr>
-                    <td>{idx}</td>
-                    <td><strong>{keyword}</strong></td>
-                    <td>{item['monthly_search']:,}</td>
-                    <td>{item['blog_count']:,}</td>
-                    <td>{item['saturation']}</td>
-                    <td>{item['possibility']}</td>
-                    <td><a href="{naver_url}" target="_blank" class="analyze-btn">🔍</a></td>
-                </tr>
-        """
+        yield (
+            f'<tr><td>{idx}</td>'
+            f'<td><strong>{keyword}</strong></td>'
+            f"<td>{item['monthly_search']:,}</td>"
+            f"<td>{item['blog_count']:,}</td>"
+            f"<td>{item['saturation']}</td>"
+            f"<td>{item['possibility']}</td>"
+            f'<td><a href="{naver_url}" target="_blank" class="analyze-btn">🔍</a></td></tr>'
+        )
     
-    html += """
-            </tbody>
-        </table>
-    </div>
-    """
+    yield '</tbody></table></div>'
     
     # 상위 20개 연관검색어 섹션
     if related_data:
-        html += """
-    <div class="related-keywords">
-        <h3>🔗 상위 20개 키워드 연관검색어</h3>
-        <p class="update-info">네이버 자동완성 기반 연관검색어입니다.</p>
-        
-        <div class="related-grid">
-    """
+        yield (
+            '<div class="related-keywords">'
+            '<h3>🔗 상위 20개 키워드 연관검색어</h3>'
+            '<p class="update-info">네이버 자동완성 기반 연관검색어입니다.</p>'
+            '<div class="related-grid">'
+        )
         for item in related_data:
             keyword = item['keyword']
             related = item['related']
             naver_url = f"https://search.naver.com/search.naver?query={keyword}"
             
-            html += f"""
-            <div class="related-card">
-                <div class="related-header">
-                    <strong>{keyword}</strong>
-                    <a href="{naver_url}" target="_blank" class="analyze-btn">🔍</a>
-                </div>
-                <ul class="related-list">
-            """
+            yield (
+                '<div class="related-card"><div class="related-header">'
+                f'<strong>{keyword}</strong>'
+                f'<a href="{naver_url}" target="_blank" class="analyze-btn">🔍</a>'
+                '</div><ul class="related-list">'
+            )
             for rel_kw in related:
                 rel_url = f"https://search.naver.com/search.naver?query={rel_kw}"
-                html += f'<li><a href="{rel_url}" target="_blank">{rel_kw}</a></li>'
+                yield f'<li><a href="{rel_url}" target="_blank">{rel_kw}</a></li>'
             
             if not related:
-                html += '<li class="no-data">연관검색어 없음</li>'
+                yield '<li class="no-data">연관검색어 없음</li>'
             
-            html += """
-                </ul>
-            </div>
-            """
+            yield '</ul>'
+            # AUTOCOMPLETE_DEPTH 2 이상에서 더 찾은 연관검색어
+            expanded = item.get('expanded')
+            if expanded:
+                yield '<div class="related-more">'
+                for ext_kw in expanded:
+                    ext_url = f"https://search.naver.com/search.naver?query={ext_kw}"
+                    yield f'<a href="{ext_url}" target="_blank">{ext_kw}</a>'
+                yield '</div>'
+            
+            yield '</div>'
         
-        html += """
-        </div>
-    </div>
-    """
-    
-    return html
+        yield '</div></div>'
 
 
-def build_html_file(ai_content, keyword_results=None):
-    """HTML 파일 생성 및 아카이브"""
+def build_html_file(ai_content, keyword_results=None, related_data=None):
+    """HTML 파일 생성 및 아카이브 (아카이브는 결과 데이터만 압축 저장)"""
     print("    🔨 [Builder] HTML 생성 중...")
     
     kst = timezone(timedelta(hours=9))
@@ -104,136 +105,128 @@ def build_html_file(ai_content, keyword_results=None):
     now_str = f"📅 업데이트: {now.strftime('%Y년 %m월 %d일 %H시 %M분')}"
     date_prefix = now.strftime("%Y-%m-%d_%H-%M")
     
-    # 상위 3개 키워드 추출 (파일명용)
+    # 상위 3개 키워드 추출 (파일명용, 경로·URL에 쓸 수 없는 문자 제거)
     if keyword_results and len(keyword_results) > 0:
-        top_keywords = [item['keyword'][:10].replace(' ', '') for item in keyword_results[:3]]
+        top_keywords = [re.sub(r"[^\w-]|_", "", item['keyword'][:10]) for item in keyword_results[:3]]
         keywords_str = "_".join(top_keywords)
-        archive_filename = f"{date_prefix}_{keywords_str}.html"
+        archive_filename = f"{date_prefix}_{keywords_str}.json.gz"
     else:
-        archive_filename = f"{date_prefix}_분석결과.html"
+        archive_filename = f"{date_prefix}_분석결과.json.gz"
     
     print(f"    📝 [Builder] 파일명: {archive_filename}")
     
-    # 기존 index.html을 archive로 백업
     output_path = "output/index.html"
     archive_dir = "output/archive"
     os.makedirs(archive_dir, exist_ok=True)
     
-    if os.path.exists(output_path):
-        archive_path = os.path.join(archive_dir, archive_filename)
-        shutil.copy(output_path, archive_path)
-        print(f"    📦 [Builder] 백업 완료: {archive_filename}")
+    # 레이아웃/아카이브 CSS를 내용 해시 스타일시트 하나로 분리
+    layout, stylesheet = _load_bundle()
     
-    # 템플릿 읽기
-    template_path = "templates/layout.html"
-    try:
-        with open(template_path, "r", encoding="utf-8") as f:
-            template = f.read()
-    except FileNotFoundError:
-        print(f"    ❌ 템플릿 파일 없음: {template_path}")
+    # 아카이브 목록 (처음 한 번만 기존 파일로 생성, 이후에는 한 줄씩 추가)
+    manifest = archive.ArchiveManifest()
+    if not manifest.exists():
+        for page in manifest.migrate(archive_dir):
+            _write_archive_page(manifest, page, stylesheet)
+        print(f"    🗂️  [Builder] 아카이브 목록 생성: {manifest.count()}개")
+    
+    # 이번 실행 결과를 압축 JSON으로 저장 (view.html이 공통 레이아웃으로 렌더링)
+    size = archive.write_snapshot(os.path.join(archive_dir, archive_filename), {
+        "run_at": now.isoformat(timespec="seconds"),
+        "update_time": now_str,
+        "keyword_results": keyword_results or [],
+        "related_data": related_data or [],
+    })
+    full_page = manifest.append(archive.parse_filename(archive_filename))
+    if full_page:
+        _write_archive_page(manifest, full_page, stylesheet)
+    print(f"    📦 [Builder] 아카이브 저장: {archive_filename} ({size / 1024:.1f}KB)")
+    
+    # 키워드 검색 색인 (처음 한 번만 기존 압축 JSON으로 생성, 이후에는 이번 키워드 파일만 수정)
+    index = search_index.SearchIndex()
+    if not index.exists():
+        runs = index.backfill(manifest, archive_dir)
+        print(f"    🔎 [Builder] 검색 색인 생성: 실행 {runs}회")
+    else:
+        shards = index.add_run(archive_filename, keyword_results or [])
+        print(f"    🔎 [Builder] 검색 색인 갱신: {shards}개 파일")
+    
+    if layout is None:
+        print(f"    ❌ 템플릿 파일 없음: {LAYOUT_PATH}")
         return
 
-    # 플레이스홀더 치환 (템플릿에 맞게 수정)
-    final_html = template.replace("{{update_time}}", now_str)
-    final_html = final_html.replace("{{keyword_content}}", ai_content)
-    
-    # 저장
+    # 플레이스홀더를 채우며 리포트 조각을 그대로 흘려 씀
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(final_html)
+        render_report_page(f, layout, stylesheet, now_str, ai_content)
+    assets.precompress(output_path)
+    
+    # 아카이브 뷰어 (레이아웃이 바뀌면 과거 결과도 새 레이아웃으로 보이도록 매번 생성)
+    with open("output/view.html", "w", encoding="utf-8") as f:
+        layout.render_to(f, stylesheet=stylesheet, **_viewer_content())
+    assets.precompress("output/view.html")
     
     # 아카이브 페이지 생성
-    archive_html = generate_archive_page(archive_dir)
-    archive_page_path = "output/archive.html"
-    with open(archive_page_path, "w", encoding="utf-8") as f:
-        f.write(archive_html)
+    _write_html("output/archive.html", generate_archive_page(manifest, stylesheet=stylesheet))
     
-    archive_count = len([f for f in os.listdir(archive_dir) if f.endswith('.html')])
+    archive_count = manifest.count()
     print(f"    ✅ [Builder] 생성 완료: output/index.html")
     print(f"    📚 [Builder] 총 {archive_count}개 아카이브 보관 중")
 
 
-def generate_archive_page(archive_dir):
-    """별도 아카이브 페이지 생성"""
-    files = sorted(
-        [f for f in os.listdir(archive_dir) if f.endswith('.html')],
-        reverse=True
-    )
-    
-    html = """<!DOCTYPE html>
+def load_layout():
+    """레이아웃 -> (<style>을 {{stylesheet}}로 바꿔 컴파일한 템플릿, 레이아웃 CSS)"""
+    with open(LAYOUT_PATH, "r", encoding="utf-8") as f:
+        page, layout_css = assets.split_style(f.read())
+    return template.Template(page), layout_css
+
+
+def render_report_page(f, layout, stylesheet, update_time, content):
+    """index.html 렌더링 (content: iter_keyword_report 조각, 또는 공백을 정리할 리포트 문자열)"""
+    if isinstance(content, str):
+        content = assets.minify_html(content)
+    layout.render_to(f, stylesheet=stylesheet, update_time=update_time, keyword_content=content)
+
+
+def _load_bundle():
+    """-> (레이아웃 템플릿 또는 None, 스타일시트 <link> 태그)"""
+    try:
+        layout, layout_css = load_layout()
+    except FileNotFoundError:
+        layout, layout_css = None, ""
+    with open(ARCHIVE_CSS_PATH, "r", encoding="utf-8") as f:
+        archive_css = f.read()
+    href = assets.write_stylesheet(layout_css + "\n" + archive_css)
+    return layout, assets.stylesheet_link(href)
+
+
+def _write_html(path, html):
+    """저장한 뒤 .gz/.br 사본 생성"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    assets.precompress(path)
+
+
+def _viewer_content():
+    """view.html 플레이스홀더 값 (압축 JSON을 받아 브라우저에서 렌더링)"""
+    with open("templates/viewer.js", "r", encoding="utf-8") as f:
+        script = f.read()
+    constants = f"const REPORT_LIMIT = {REPORT_LIMIT};\nconst MAX_SATURATION = {json.dumps(MAX_SATURATION)};\n"
+    return {
+        "update_time": '<span id="archive-time"></span>',
+        "keyword_content": (
+            '<div id="archive-view"><p>불러오는 중...</p></div>\n'
+            f"<script>\n{constants}{script}</script>"
+        ),
+    }
+
+
+_ARCHIVE_HEAD = template.Template("""<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>과거 분석 결과 - 블로그 키워드 인사이트</title>
+    <title>{{title}}</title>
     <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        :root {
-            --dancheong-blue: #1e3a8a;
-            --dancheong-gold: #f59e0b;
-            --text-primary: #1f2937;
-            --text-secondary: #6b7280;
-            --border-color: #e5e7eb;
-        }
-        * { box-sizing: border-box; margin: 0; padding: 0; }
-        body {
-            font-family: 'Noto Sans KR', sans-serif;
-            background: linear-gradient(180deg, #f0f4ff 0%, #f8fafc 100%);
-            min-height: 100vh;
-            color: var(--text-primary);
-            line-height: 1.7;
-        }
-        .header {
-            background: linear-gradient(135deg, var(--dancheong-blue) 0%, #1e40af 100%);
-            padding: 2rem;
-            text-align: center;
-            color: white;
-        }
-        .header h1 { font-size: 1.5rem; margin-bottom: 0.5rem; }
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 2rem 1rem;
-        }
-        .back-btn {
-            display: inline-block;
-            padding: 10px 20px;
-            background: var(--dancheong-blue);
-            color: white;
-            text-decoration: none;
-            border-radius: 6px;
-            margin-bottom: 1.5rem;
-        }
-        .back-btn:hover { background: #1e40af; }
-        .archive-list { list-style: none; }
-        .archive-list li {
-            background: white;
-            margin-bottom: 10px;
-            border-radius: 8px;
-            border: 1px solid var(--border-color);
-            transition: all 0.2s;
-        }
-        .archive-list li:hover {
-            border-color: var(--dancheong-blue);
-            box-shadow: 0 2px 8px rgba(30, 58, 138, 0.15);
-        }
-        .archive-list a {
-            display: flex;
-            justify-content: space-between;
-            padding: 14px 18px;
-            color: var(--text-primary);
-            text-decoration: none;
-        }
-        .archive-date { color: var(--text-secondary); font-size: 0.9rem; }
-        .archive-keywords { color: var(--dancheong-blue); font-size: 0.9rem; }
-        .count-info {
-            background: #fffbeb;
-            border: 1px solid var(--dancheong-gold);
-            padding: 1rem;
-            border-radius: 8px;
-            margin-bottom: 1.5rem;
-            text-align: center;
-        }
-    </style>
+    {{stylesheet}}
 </head>
 <body>
     <header class="header">
@@ -243,45 +236,94 @@ def generate_archive_page(archive_dir):
     <div class="container">
         <a href="index.html" class="back-btn">← 메인으로 돌아가기</a>
         <div class="count-info">
-            <strong>"""
-    
-    html += str(len(files))
-    html += """</strong>개의 분석 결과가 저장되어 있습니다.
+            <strong>""")
+
+_ARCHIVE_SEARCH = """
+        <div class="archive-search">
+            <input type="search" id="search-input" placeholder="🔍 키워드로 과거 결과 찾기 (예: 엘지전자주가)" autocomplete="off">
+            <ul id="search-results" class="search-results"></ul>
         </div>
-        <ul class="archive-list">
 """
+
+_ARCHIVE_FOOT = template.Template("""
+        </ul>
+    </div>
+    <script>
+{{search_script}}</script>
+</body>
+</html>""")
+
+
+def _archive_item(entry):
+    """아카이브 목록 한 줄"""
+    filename = entry['file']
+    # 압축 JSON 아카이브는 뷰어로, 예전 HTML 스냅샷은 파일로 바로 연결
+    href = f"view.html?run={filename}" if filename.endswith(".json.gz") else f"archive/{filename}"
+    if not entry.get('run_at'):
+        return f'<li><a href="{href}" target="_blank">📄 {filename}</a></li>'
     
-    for filename in files:
-        parts = filename.replace('.html', '').split('_')
-        
-        if len(parts) >= 2:
-            date_part = parts[0]
-            time_part = parts[1]
-            keywords_part = '_'.join(parts[2:]) if len(parts) > 2 else "분석결과"
-            
-            try:
-                date_obj = datetime.strptime(f"{date_part} {time_part}", "%Y-%m-%d %H-%M")
-                display_date = date_obj.strftime("%Y년 %m월 %d일 %H:%M")
-            except:
-                display_date = f"{date_part} {time_part}"
-            
-            keywords_display = keywords_part.replace('_', ' · ')
-            
-            html += f'''
+    display_date = datetime.fromisoformat(entry['run_at']).strftime("%Y년 %m월 %d일 %H:%M")
+    keywords_display = ' · '.join(entry['keywords']) or "분석결과"
+    return f'''
             <li>
-                <a href="archive/{filename}" target="_blank">
+                <a href="{href}" target="_blank">
                     <span class="archive-date">📅 {display_date}</span>
                     <span class="archive-keywords">🔑 {keywords_display}</span>
                 </a>
             </li>
 '''
-        else:
-            html += f'<li><a href="archive/{filename}" target="_blank">📄 {filename}</a></li>'
-    
-    html += """
-        </ul>
-    </div>
-</body>
-</html>"""
+
+
+def _pagination(manifest, current=None):
+    """페이지 링크 (페이지 파일은 읽지 않음)
+
+    archive-N.html은 한 번만 렌더링되어 이후 페이지를 알 수 없으므로
+    매번 다시 만드는 최신 목록(archive.html)에만 전체 페이지 링크를 둔다.
+    """
+    if current is not None:
+        return ('<div class="pagination"><a href="archive.html">최신 목록 · 전체 페이지</a>'
+                f'<span class="current">{current}</span></div>')
+    full_pages = manifest.count() // manifest.page_size
+    if not full_pages:
+        return ""
+    links = ['<span class="current">최신</span>']
+    links.extend(f'<a href="archive-{page}.html">{page}</a>' for page in range(full_pages, 0, -1))
+    return f'<div class="pagination">{"".join(links)}</div>'
+
+
+def generate_archive_page(manifest, page=None, stylesheet=""):
+    """아카이브 목록 페이지 생성 (page=None이면 최근 항목, 아니면 해당 페이지)"""
+    if page is None:
+        entries = manifest.latest(manifest.page_size)
+        title = "과거 분석 결과 - 블로그 키워드 인사이트"
+    else:
+        entries = list(reversed(manifest.read_page(page)))
+        title = f"과거 분석 결과 {page}페이지 - 블로그 키워드 인사이트"
     
-    return html
+    parts = [_ARCHIVE_HEAD.render(title=title, stylesheet=stylesheet)]
+    if page is None:
+        parts.append(str(manifest.count()))
+        parts.append("""</strong>개의 분석 결과가 저장되어 있습니다.
+        </div>
+""")
+    else:
+        # 한 번만 렌더링하는 페이지라 바뀌는 전체 개수 대신 이 페이지의 범위만 표시
+        first = (page - 1) * manifest.page_size + 1
+        parts.append(f"{first}~{first + len(entries) - 1}번째")
+        parts.append("""</strong> 분석 결과입니다.
+        </div>
+""")
+    parts.append(_ARCHIVE_SEARCH)
+    parts.append(_pagination(manifest, page))
+    parts.append("""
+        <ul class="archive-list">
+""")
+    parts.extend(assets.minify_html(_archive_item(entry)) for entry in entries)
+    with open("templates/search.js", "r", encoding="utf-8") as f:
+        parts.append(_ARCHIVE_FOOT.render(search_script=f.read()))
+    return "".join(parts)
+
+
+def _write_archive_page(manifest, page, stylesheet):
+    """가득 찬 페이지는 한 번만 렌더링 (이후 바뀌지 않음)"""
+    _write_html(f"output/archive-{page}.html", generate_archive_page(manifest, page, stylesheet))
@@ -0,0 +1,169 @@
+"""외부 HTTP/LLM 호출 녹화·재생 (카세트)
+
+CASSETTE_MODE=record  : 실제로 호출하면서 모든 요청/응답을 카세트 파일에 저장
+CASSETTE_MODE=replay  : 네트워크 없이 카세트 파일의 응답을 순서대로 돌려줌
+CASSETTE_PATH         : 카세트 파일 경로 (gzip JSON Lines)
+CASSETTE_LATENCY=1    : 재생 시 녹화된 응답 시간만큼 대기
+"""
+import os
+import json
+import gzip
+import time
+import base64
+import atexit
+import hashlib
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_PATH = "cassettes/run.jsonl.gz"
+
+# 재생에 필요한 응답 헤더만 저장
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+
+class CassetteMiss(requests.ConnectionError):
+    """재생 모드에서 녹화되지 않은 요청"""
+
+
+class Cassette:
+    def __init__(self, path, mode):
+        self.path = path
+        self.mode = mode
+        self.entries = []
+        self._replay = {}
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self._load()
+        elif mode == "record":
+            atexit.register(self.save)
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                self._replay.setdefault(entry["key"], []).append(entry)
+        print(f"    📼 [Cassette] 재생 모드: {sum(len(v) for v in self._replay.values())}개 응답 로드")
+
+    def save(self):
+        if not self.entries:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        print(f"    📼 [Cassette] {len(self.entries)}개 응답 녹화: {self.path}")
+
+    def _append(self, entry):
+        with self._lock:
+            self.entries.append(entry)
+
+    def _next(self, key, description):
+        """같은 키의 응답을 녹화 순서대로 꺼냄 (다 쓰면 마지막 응답 반복)"""
+        with self._lock:
+            queue = self._replay.get(key)
+            if not queue:
+                raise CassetteMiss(f"카세트에 없는 요청: {description}")
+            entry = queue.pop(0) if len(queue) > 1 else queue[0]
+        if os.environ.get("CASSETTE_LATENCY") == "1":
+            time.sleep(entry.get("elapsed", 0))
+        return entry
+
+    # ----- HTTP -----
+
+    def http(self, method, url, params, send):
+        """HTTP 요청 녹화/재생 (헤더는 서명·타임스탬프가 매번 달라서 키에서 제외)"""
+        key = _key("http", method.upper(), url, params)
+
+        if self.mode == "replay":
+            entry = self._next(key, f"{method} {url}")
+            return _build_response(entry, url)
+
+        start = time.perf_counter()
+        response = send()
+        elapsed = time.perf_counter() - start
+
+        body = response.content
+        try:
+            stored, encoding = body.decode("utf-8"), "text"
+        except UnicodeDecodeError:
+            stored, encoding = base64.b64encode(body).decode(), "base64"
+        self._append({
+            "kind": "http",
+            "key": key,
+            "status": response.status_code,
+            "headers": {h: response.headers[h] for h in KEPT_HEADERS if h in response.headers},
+            "encoding": response.encoding,
+            "body": stored,
+            "body_encoding": encoding,
+            "elapsed": round(elapsed, 3),
+        })
+        return response
+
+    # ----- LLM 등 함수 호출 -----
+
+    def call(self, kind, payload, fn):
+        """JSON으로 저장 가능한 결과를 돌려주는 호출 녹화/재생"""
+        key = _key(kind, payload)
+
+        if self.mode == "replay":
+            return self._next(key, kind)["result"]
+
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        self._append({
+            "kind": kind,
+            "key": key,
+            "result": result,
+            "elapsed": round(elapsed, 3),
+        })
+        return result
+
+
+def _key(*parts):
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+
+def _build_response(entry, url):
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = entry.get("encoding")
+    response.url = url
+    if entry["body_encoding"] == "base64":
+        response._content = base64.b64decode(entry["body"])
+    else:
+        response._content = entry["body"].encode("utf-8")
+    return response
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def mode():
+    """환경변수는 .env 로드 이후에 읽도록 호출 시점에 확인"""
+    return os.environ.get("CASSETTE_MODE", "").lower()
+
+
+def active():
+    return mode() in ("record", "replay")
+
+
+def is_replay():
+    return mode() == "replay"
+
+
+def get():
+    """현재 모드의 카세트 (녹화/재생이 아니면 None)"""
+    global _cassette
+    if not active():
+        return None
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = Cassette(os.environ.get("CASSETTE_PATH", DEFAULT_PATH), mode())
+    return _cassette
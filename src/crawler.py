@@ -1,208 +1,315 @@
 import os
+import json
+import hashlib
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+from src import http_cache
 from dotenv import load_dotenv
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 load_dotenv()
 
-def fetch_naver_ranking_news():
-    """네이버 언론사별 랭킹 뉴스 수집 (2026년 1월 최신 버전)"""
-    print("    🕷️  [Naver] 크롤링 시작...")
-    url = "https://news.naver.com/main/ranking/popularDay.naver"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Referer": "https://www.naver.com/",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7"
-    }
-    
-    try:
-        res = requests.get(url, headers=headers, timeout=15)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, 'html.parser')
-        
-        # 방법 1: 랭킹 뉴스 박스
-        press_boxes = soup.select('.rankingnews_box')
-        
-        if not press_boxes:
-            # 방법 2: 대체 셀렉터 시도
-            print("    🔄 [Naver] 대체 셀렉터 시도...")
-            press_boxes = soup.select('div.rankingnews_box_wrap div.rankingnews_box')
-        
-        if not press_boxes:
-            print("    ⚠️  [Naver] 뉴스 박스를 찾을 수 없습니다.")
-            print(f"    💡 HTML 일부: {soup.text[:200]}")
-            return []
-        
-        news_list = []
-        for box in press_boxes:
-            # 언론사 이름
-            press_name = box.select_one('.rankingnews_name')
-            if not press_name:
-                press_name = box.select_one('strong.rankingnews_name')
-            if not press_name:
+BROWSER_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+SHORT_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+# 파싱 모드: "fast" = lxml + 필요한 컨테이너만 파싱, "full" = html.parser 전체 트리
+PARSE_MODE = os.environ.get("CRAWLER_PARSE_MODE", "fast")
+# _extract 등 추출 코드를 바꾸면 올려서 저장된 파싱 결과를 무효화
+PARSER_VERSION = 1
+
+# 뉴스 소스 레지스트리
+# - items: 헤드라인 항목 셀렉터 (앞에서부터 시도하는 대체 체인)
+# - title: 항목 안에서 제목을 찾는 셀렉터 체인 (없으면 항목 자체가 제목)
+# - prefix: 항목 안에서 말머리를 찾는 셀렉터 체인 (없으면 tag 사용)
+# - limit: 필터 전에 자를 항목 수, max_items: 최종 반환 개수
+# - min_length: 최소 제목 길이, include: 제목에 하나라도 포함돼야 하는 단어
+# - parse_targets: fast 모드에서 트리로 만들 컨테이너 클래스
+# - deadline: 수집 마감시간(초), max_age: 캐시 유효시간(초)
+SOURCES = [
+    {
+        "name": "naver_ranking",
+        "label": "Naver",
+        "url": "https://news.naver.com/main/ranking/popularDay.naver",
+        "headers": {
+            "User-Agent": BROWSER_UA,
+            "Referer": "https://www.naver.com/",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7"
+        },
+        "parser": "html",
+        "parse_targets": ["rankingnews_box_wrap", "rankingnews_box"],
+        "items": [".rankingnews_box", "div.rankingnews_box_wrap div.rankingnews_box"],
+        "title": [".list_content li a", "ul.rankingnews_list li a"],
+        "prefix": [".rankingnews_name", "strong.rankingnews_name"],
+        "sort_by_length": True,  # 제목 길이순 정렬 후 상위 20개
+        "max_items": 20,
+        "deadline": 15,
+        "max_age": 600,
+    },
+    {
+        "name": "naver_main",
+        "label": "Naver Main",
+        "url": "https://news.naver.com/",
+        "headers": {"User-Agent": SHORT_UA},
+        "parser": "html",
+        "items": [".cjs_news_headlines .cjs_t", ".sh_text._sh_text_headline"],
+        "tag": "네이버메인",
+        "limit": 20,
+        "min_length": 16,
+        "backup_for": "naver_ranking",  # 랭킹 수집 실패 시에만 사용
+        "deadline": 15,
+        "max_age": 300,
+    },
+    {
+        "name": "policy",
+        "label": "Policy",
+        "url": "https://www.korea.kr/rss/policy.xml",
+        "headers": {"User-Agent": SHORT_UA},
+        "parser": "xml",
+        "items": ["item"],
+        "title": ["title"],
+        "tag": "정부정책",
+        "limit": 15,
+        "include": ["지원", "신청", "지급", "환급", "무료", "개시", "특가", "혜택", "보조금"],
+        "deadline": 15,
+        "max_age": 1800,
+    },
+    {
+        "name": "daum",
+        "label": "Daum",
+        "url": "https://news.daum.net/ranking/popular/",
+        "headers": {
+            "User-Agent": BROWSER_UA,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "ko-KR,ko;q=0.9"
+        },
+        "parser": "html",
+        "parse_targets": ["list_news2", "rank_news"],
+        "items": [".list_news2 .link_txt", "ul.list_news2 li a.link_txt", "div.rank_news a"],
+        "tag": "Daum",
+        "limit": 15,
+        "min_length": 11,  # 너무 짧은 제목 제외
+        "deadline": 15,
+        "max_age": 600,
+    },
+]
+
+# 소스별 최근 수집 지표 (fetch/parse 지연시간, 항목 수, 매칭된 셀렉터)
+SOURCE_METRICS = {}
+
+_compiled = {}
+
+
+def get_source(name):
+    for source in SOURCES:
+        if source["name"] == name:
+            return source
+    raise KeyError(name)
+
+
+def _compile_chain(chain):
+    """셀렉터 체인을 한 번만 컴파일해서 재사용"""
+    compiled = []
+    for selector in chain or []:
+        if selector not in _compiled:
+            _compiled[selector] = soupsieve.compile(selector)
+        compiled.append(_compiled[selector])
+    return compiled
+
+
+def _select_first(node, chain):
+    """체인 안에서 처음 매칭되는 요소 (항목 내부용)"""
+    for pattern in _compile_chain(chain):
+        found = pattern.select_one(node)
+        if found:
+            return found
+    return None
+
+
+def _select_items(soup, chain):
+    """체인 안에서 처음 결과가 나오는 셀렉터의 (순번, 요소목록)"""
+    for idx, pattern in enumerate(_compile_chain(chain)):
+        found = pattern.select(soup)
+        if found:
+            return idx, found
+    return None, []
+
+
+def make_soup(markup, source=None, mode=None):
+    """소스에 맞는 BeautifulSoup 생성 (fast 모드는 대상 컨테이너만 파싱)"""
+    mode = mode or PARSE_MODE
+    targets = get_source(source).get("parse_targets") if source else None
+    if mode == "fast" and targets:
+        strainer = SoupStrainer(class_=targets)
+        return BeautifulSoup(markup, "lxml", parse_only=strainer)
+    return BeautifulSoup(markup, "html.parser")
+
+
+def _extract(source, soup):
+    """파싱된 문서에서 헤드라인 추출 -> (매칭된 셀렉터 순번, 헤드라인 목록)"""
+    matched, items = _select_items(soup, source["items"])
+    if not items:
+        return None, []
+
+    if source.get("limit"):
+        items = items[:source["limit"]]
+
+    headlines = []
+    for item in items:
+        if source.get("prefix"):
+            prefix = _select_first(item, source["prefix"])
+            if not prefix:
                 continue
-            press_name = press_name.get_text(strip=True)
-
-            # 1위 뉴스
-            first_news = box.select_one('.list_content li a')
-            if not first_news:
-                first_news = box.select_one('ul.rankingnews_list li a')
-            
-            if first_news:
-                title = first_news.get_text(strip=True)
-                news_list.append(f"[{press_name}] {title}")
-
-        if news_list:
-            # 제목 길이순 정렬 후 상위 20개
-            news_list.sort(key=len, reverse=True)
-            final_list = news_list[:20]
-            print(f"    ✅ {len(final_list)}개 수집 완료")
-            return final_list
+            prefix = prefix.get_text(strip=True)
         else:
-            print("    ⚠️  [Naver] 뉴스를 추출할 수 없습니다.")
-            return []
+            prefix = source["tag"]
 
-    except requests.RequestException as e:
-        print(f"    ❌ [Naver] 요청 에러: {e}")
-        return []
-    except Exception as e:
-        print(f"    ❌ [Naver] 파싱 에러: {e}")
-        return []
+        node = _select_first(item, source["title"]) if source.get("title") else item
+        if not node:
+            continue
+        title = node.get_text(strip=True)
 
+        if not title or len(title) < source.get("min_length", 1):
+            continue
+        if source.get("include") and not any(k in title for k in source["include"]):
+            continue
+        headlines.append(f"[{prefix}] {title}")
 
-def fetch_policy_api():
-    """정책브리핑 RSS 방식으로 수집 (API 대신)"""
-    print("    🏛️  [Policy] RSS 수집 중...")
-    
-    # API 대신 RSS 사용
-    url = "https://www.korea.kr/rss/policy.xml"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-    }
-    
-    try:
-        res = requests.get(url, headers=headers, timeout=15)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.content, 'xml')
-        
-        items = soup.find_all('item')
-        if not items:
-            print("    ⚠️  [Policy] RSS 항목이 없습니다.")
-            return []
-        
-        policy_list = []
-        money_keywords = ["지원", "신청", "지급", "환급", "무료", "개시", "특가", "혜택", "보조금"]
-        
-        for item in items[:15]:  # 상위 15개
-            title_tag = item.find('title')
-            if not title_tag:
-                continue
-            title = title_tag.text.strip()
-            
-            # 키워드 필터링
-            if any(k in title for k in money_keywords):
-                policy_list.append(f"[정부정책] {title}")
-                
-        if policy_list:
-            print(f"    ✅ {len(policy_list)}개 수집 완료")
-            return policy_list
+    if source.get("sort_by_length"):
+        headlines.sort(key=len, reverse=True)
+    if source.get("max_items"):
+        headlines = headlines[:source["max_items"]]
+    return matched, headlines
+
+
+def parser_fingerprint(source):
+    """소스 설정 + 파싱 모드 + 추출 코드 버전 해시 (http_cache가 파싱 결과 재사용 여부 판단)"""
+    raw = json.dumps([source, PARSE_MODE, PARSER_VERSION], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def fetch_source(source):
+    """레지스트리에 선언된 소스 하나를 수집 (공통 엔진)"""
+    name, label = source["name"], source["label"]
+    print(f"    🕷️  [{label}] 수집 시작...")
+    metrics = {"fetch_ms": 0, "parse_ms": 0, "items": 0, "matched_selector": None, "cached": True}
+    SOURCE_METRICS[name] = metrics
+
+    def parse(res):
+        parse_start = time.perf_counter()
+        metrics["cached"] = False
+        if source["parser"] == "xml":
+            soup = BeautifulSoup(res.content, "xml")
         else:
-            print("    ⚠️  [Policy] 키워드 매칭 뉴스 없음")
-            return []
+            soup = make_soup(res.text, name)
+
+        matched, headlines = _extract(source, soup)
+        if matched is None and source.get("parse_targets") and PARSE_MODE == "fast":
+            # 페이지 구조가 바뀐 경우 전체 파싱으로 재시도
+            soup = make_soup(res.text, mode="full")
+            matched, headlines = _extract(source, soup)
+
+        if matched is None:
+            print(f"    ⚠️  [{label}] 항목을 찾을 수 없습니다.")
+            print(f"    💡 HTML 일부: {soup.text[:200]}")
+        elif matched > 0:
+            print(f"    🔄 [{label}] 대체 셀렉터 사용: {source['items'][matched]}")
+        metrics["matched_selector"] = matched
+        metrics["parse_ms"] = round((time.perf_counter() - parse_start) * 1000, 1)
+        return headlines
 
+    start = time.perf_counter()
+    try:
+        headlines = http_cache.fetch(
+            source["url"], parse, headers=source["headers"], max_age=source.get("max_age", 0),
+            fingerprint=parser_fingerprint(source),
+        )
     except requests.RequestException as e:
-        print(f"    ❌ [Policy] RSS 에러: {e}")
+        print(f"    ❌ [{label}] 요청 에러: {e}")
+        metrics["error"] = str(e)
         return []
     except Exception as e:
-        print(f"    ❌ [Policy] 파싱 에러: {e}")
+        print(f"    ❌ [{label}] 파싱 에러: {e}")
+        metrics["error"] = str(e)
         return []
+    finally:
+        total_ms = (time.perf_counter() - start) * 1000
+        metrics["fetch_ms"] = round(total_ms - metrics["parse_ms"], 1)
+
+    metrics["items"] = len(headlines)
+    if headlines:
+        print(f"    ✅ [{label}] {len(headlines)}개 수집 완료")
+    else:
+        print(f"    ⚠️  [{label}] 유효한 뉴스가 없습니다.")
+    return headlines
+
+
+def fetch_naver_ranking_news():
+    """네이버 언론사별 랭킹 뉴스 수집 (2026년 1월 최신 버전)"""
+    return fetch_source(get_source("naver_ranking"))
+
+
+def fetch_policy_api():
+    """정책브리핑 RSS 방식으로 수집 (API 대신)"""
+    return fetch_source(get_source("policy"))
 
 
 def fetch_daum_news():
     """다음 뉴스 랭킹 수집 (2026년 1월 최신 URL)"""
-    print("    🕷️  [Daum] 크롤링 시작...")
-    url = "https://news.daum.net/ranking/popular/"  # URL 끝에 / 추가
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "ko-KR,ko;q=0.9"
-    }
-    
-    try:
-        res = requests.get(url, headers=headers, timeout=15)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, 'html.parser')
-        
-        # 방법 1: 기존 셀렉터
-        news_list = soup.select('.list_news2 .link_txt')
-        
-        if not news_list:
-            # 방법 2: 대체 셀렉터
-            print("    🔄 [Daum] 대체 셀렉터 시도...")
-            news_list = soup.select('ul.list_news2 li a.link_txt')
-        
-        if not news_list:
-            # 방법 3: 더 넓은 범위
-            news_list = soup.select('div.rank_news a')
-        
-        if not news_list:
-            print("    ⚠️  [Daum] 뉴스 리스트를 찾을 수 없습니다.")
-            print(f"    💡 HTML 일부: {soup.text[:200]}")
-            return []
-        
-        headlines = []
-        for news in news_list[:15]:
-            title = news.get_text(strip=True)
-            if title and len(title) > 10:  # 너무 짧은 제목 제외
-                headlines.append(f"[Daum] {title}")
-        
-        if headlines:
-            print(f"    ✅ {len(headlines)}개 수집 완료")
-            return headlines
-        else:
-            print("    ⚠️  [Daum] 유효한 뉴스가 없습니다.")
-            return []
-        
-    except requests.RequestException as e:
-        print(f"    ❌ [Daum] 요청 에러: {e}")
-        return []
-    except Exception as e:
-        print(f"    ❌ [Daum] 파싱 에러: {e}")
-        return []
+    return fetch_source(get_source("daum"))
 
 
 # 추가: 네이버 메인 헤드라인 수집 (백업용)
 def fetch_naver_main_headlines():
     """네이버 메인 페이지 헤드라인 수집 (백업용)"""
-    print("    🕷️  [Naver Main] 크롤링 시작...")
-    url = "https://news.naver.com/"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+    return fetch_source(get_source("naver_main"))
+
+
+def collect_all_news(deadlines=None):
+    """레지스트리의 모든 뉴스 소스를 동시에 수집 (소스별 마감시간 적용)
+
+    백업 소스(backup_for)는 주 소스 실패를 기다리지 않고 처음부터 함께 실행한다.
+    마감시간 안에 끝나지 않은 소스는 None으로 반환한다.
+    """
+    deadlines = {
+        **{source["name"]: source["deadline"] for source in SOURCES},
+        **(deadlines or {}),
     }
-    
-    try:
-        res = requests.get(url, headers=headers, timeout=15)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, 'html.parser')
-        
-        # 헤드라인 수집
-        headlines = soup.select('.cjs_news_headlines .cjs_t')
-        
-        if not headlines:
-            headlines = soup.select('.sh_text._sh_text_headline')
-        
-        news_list = []
-        for h in headlines[:20]:
-            title = h.get_text(strip=True)
-            if title and len(title) > 15:
-                news_list.append(f"[네이버메인] {title}")
-        
-        if news_list:
-            print(f"    ✅ {len(news_list)}개 수집 완료")
-        return news_list
-        
-    except Exception as e:
-        print(f"    ❌ [Naver Main] 에러: {e}")
-        return []
+
+    executor = ThreadPoolExecutor(max_workers=len(SOURCES))
+    start = time.monotonic()
+    futures = {source["name"]: executor.submit(fetch_source, source) for source in SOURCES}
+
+    results = {}
+    for name in sorted(futures, key=lambda n: deadlines[n]):
+        remaining = deadlines[name] - (time.monotonic() - start)
+        try:
+            results[name] = futures[name].result(timeout=max(0, remaining))
+        except FutureTimeoutError:
+            print(f"    ⏰ [{name}] 마감시간 {deadlines[name]}초 초과 - 결과 제외")
+            results[name] = None
+        except Exception as e:
+            print(f"    ❌ [{name}] 수집 에러: {e}")
+            results[name] = None
+
+    # 마감을 넘긴 작업은 기다리지 않는다
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.monotonic() - start
+    print(f"    ⏱️  전체 수집 시간: {elapsed:.1f}초")
+    print_source_metrics()
+    return results
+
+
+def print_source_metrics():
+    """소스별 수집 지표 출력"""
+    for name, m in SOURCE_METRICS.items():
+        if m.get("error"):
+            print(f"       - {name}: 실패 ({m['error']})")
+            continue
+        cached = " (캐시)" if m["cached"] else ""
+        matched = "-" if m["matched_selector"] is None else m["matched_selector"]
+        print(f"       - {name}: fetch {m['fetch_ms']}ms, parse {m['parse_ms']}ms, "
+              f"{m['items']}개, 셀렉터 #{matched}{cached}")
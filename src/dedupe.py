@@ -0,0 +1,77 @@
+from src.textutil import normalize_headline, estimate_tokens
+
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.5  # 글자 3-gram Jaccard 유사도 기준
+
+
+def _shingles(text, k=SHINGLE_SIZE):
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def _jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def cluster_headlines(headlines, threshold=SIMILARITY_THRESHOLD):
+    """같은 기사를 다룬 헤드라인을 묶어서 대표 헤드라인만 반환
+
+    출처 말머리를 떼고 정규화한 제목의 글자 3-gram Jaccard 유사도로
+    묶는다. 대표는 묶음에서 정규화한 제목이 가장 긴 제목(정보가 가장 많은 제목)이다.
+
+    반환: (대표 헤드라인 목록, 리포트 dict)
+    """
+    items = []
+    seen = set()
+    for headline in headlines:
+        if headline in seen:
+            continue
+        seen.add(headline)
+        norm = normalize_headline(headline)
+        items.append((headline, norm, _shingles(norm)))
+
+    # union-find
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(items)):
+        for j in range(i + 1, len(items)):
+            a, b = items[i][2], items[j][2]
+            # 크기 차이만으로 기준을 넘을 수 없는 쌍은 건너뜀
+            if min(len(a), len(b)) < threshold * max(len(a), len(b)):
+                continue
+            if items[i][1] == items[j][1] or _jaccard(a, b) >= threshold:
+                parent[find(j)] = find(i)
+
+    clusters = {}
+    for idx, item in enumerate(items):
+        clusters.setdefault(find(idx), []).append(item)
+
+    representatives = []
+    dropped = []
+    for members in clusters.values():
+        # 말머리·태그를 뺀 정규화 제목 길이로 비교 ([Daum] [단독] 같은 말머리는 정보가 아님)
+        best = max(members, key=lambda item: len(item[1]))[0]
+        representatives.append(best)
+        dropped.extend(item[0] for item in members if item[0] is not best)
+
+    tokens_before = sum(estimate_tokens(f"- {h}\n") for h in headlines)
+    tokens_after = sum(estimate_tokens(f"- {h}\n") for h in representatives)
+    report = {
+        "input": len(headlines),
+        "exact_duplicates": len(headlines) - len(items),
+        "clusters": len(representatives),
+        "merged": len(dropped),
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after,
+    }
+    return representatives, report
@@ -0,0 +1,89 @@
+import os
+import json
+import time
+import sqlite3
+from src.textutil import normalize_headline, source_of
+
+DB_PATH = os.environ.get("HEADLINE_DB_PATH", ".cache/headlines.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS headlines (
+    norm TEXT PRIMARY KEY,
+    headline TEXT NOT NULL,
+    source TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    seen_count INTEGER NOT NULL DEFAULT 1,
+    keywords TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_headlines_last_seen ON headlines(last_seen);
+CREATE INDEX IF NOT EXISTS idx_headlines_source ON headlines(source);
+"""
+
+
+class HeadlineStore:
+    """정규화된 헤드라인별 최초/최근 수집 시각, 출처, 추출 키워드 저장소"""
+
+    def __init__(self, path=DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def record(self, headlines, now=None):
+        """이번 실행의 헤드라인 기록 -> (새 헤드라인 목록, {기존 헤드라인: 키워드})
+
+        키워드가 아직 저장되지 않은 헤드라인도 새 헤드라인으로 본다.
+        """
+        now = now or time.time()
+        new_headlines = []
+        known = {}
+
+        with self.conn:
+            for headline in headlines:
+                norm = normalize_headline(headline)
+                if not norm:
+                    continue
+                row = self.conn.execute(
+                    "SELECT keywords FROM headlines WHERE norm = ?", (norm,)
+                ).fetchone()
+
+                if row is None:
+                    self.conn.execute(
+                        "INSERT INTO headlines (norm, headline, source, first_seen, last_seen) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (norm, headline, source_of(headline), now, now),
+                    )
+                    new_headlines.append(headline)
+                    continue
+
+                self.conn.execute(
+                    "UPDATE headlines SET last_seen = ?, seen_count = seen_count + 1 WHERE norm = ?",
+                    (now, norm),
+                )
+                if row[0] is None:
+                    new_headlines.append(headline)
+                else:
+                    known[headline] = json.loads(row[0])
+
+        return new_headlines, known
+
+    def save_keywords(self, mapping):
+        """헤드라인별 추출 키워드 저장"""
+        with self.conn:
+            for headline, keywords in mapping.items():
+                if headline is None:
+                    continue
+                self.conn.execute(
+                    "UPDATE headlines SET keywords = ? WHERE norm = ?",
+                    (json.dumps(keywords, ensure_ascii=False), normalize_headline(headline)),
+                )
+
+    def prune(self, max_age_days=90):
+        """오래 보이지 않은 헤드라인 삭제"""
+        cutoff = time.time() - max_age_days * 86400
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM headlines WHERE last_seen < ?", (cutoff,))
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.close()
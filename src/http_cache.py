@@ -0,0 +1,195 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from src import http_client, cassette
+
+CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", ".cache/http")
+MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+class CachedResponse:
+    """디스크에 저장된 본문을 requests.Response처럼 다루기 위한 래퍼"""
+
+    def __init__(self, content, encoding=None, status_code=200):
+        self.content = content
+        self.encoding = encoding or "utf-8"
+        self.status_code = status_code
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+
+class HttpCache:
+    """ETag/Last-Modified 기반 조건부 GET 디스크 캐시
+
+    본문과 함께 파싱 결과도 저장해서, 304 응답이면 다운로드와
+    BeautifulSoup 재파싱을 모두 건너뛴다. 파싱 결과는 만든 파서의 지문
+    (fingerprint)과 함께 저장하고, 지문이 다르면 저장된 본문을 다시 파싱한다.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = {"fresh": 0, "revalidated": 0, "downloaded": 0}
+        self._lock = threading.Lock()
+
+    def _key(self, url, params=None):
+        raw = url + "?" + json.dumps(params or {}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _paths(self, key):
+        return (
+            os.path.join(self.cache_dir, f"{key}.json"),
+            os.path.join(self.cache_dir, f"{key}.body"),
+        )
+
+    def _load(self, key):
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+            return meta, body
+        except (OSError, ValueError):
+            return None, None
+
+    def _write_meta(self, key, meta):
+        meta_path, _ = self._paths(key)
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    def _store(self, key, meta, body):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _, body_path = self._paths(key)
+        tmp_path = body_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, body_path)
+        self._write_meta(key, meta)
+
+    def fetch(self, url, parse, headers=None, params=None, max_age=0, fingerprint=None):
+        """URL을 조건부 GET으로 가져와 parse(response) 결과를 반환
+
+        max_age(초) 안의 캐시는 요청 없이 바로 사용하고, 그 이후에는
+        If-None-Match / If-Modified-Since로 재검증한다.
+        fingerprint: 파서 설정이 바뀌면 달라지는 값 (셀렉터, 파싱 모드 등)
+        """
+        if cassette.active():
+            # 녹화/재생 중에는 디스크 캐시 상태에 따라 결과가 달라지지 않도록 우회
+            res = http_client.get(url, headers=headers, params=params)
+            res.raise_for_status()
+            return parse(res)
+
+        key = self._key(url, params)
+        meta, body = self._load(key)
+        now = time.time()
+
+        if meta and now - meta["fetched_at"] < max_age:
+            self.stats["fresh"] += 1
+            print(f"    ♻️  [Cache] 캐시 사용 ({int(now - meta['fetched_at'])}초 전 수집)")
+            return self._parsed(key, meta, body, parse, fingerprint)
+
+        req_headers = dict(headers or {})
+        if meta:
+            if meta.get("etag"):
+                req_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                req_headers["If-Modified-Since"] = meta["last_modified"]
+
+        res = http_client.get(url, headers=req_headers, params=params)
+
+        if res.status_code == 304 and meta:
+            self.stats["revalidated"] += 1
+            print("    ♻️  [Cache] 변경 없음 (304)")
+            meta["fetched_at"] = now
+            return self._parsed(key, meta, body, parse, fingerprint, force_write=True)
+
+        res.raise_for_status()
+        self.stats["downloaded"] += 1
+        parsed = parse(res)
+
+        meta = {
+            "url": url,
+            "fetched_at": now,
+            "etag": res.headers.get("ETag"),
+            "last_modified": res.headers.get("Last-Modified"),
+            "encoding": res.encoding,
+            "size": len(res.content),
+            "parser": fingerprint,
+            "parsed": parsed,
+        }
+        with self._lock:
+            self._store(key, meta, res.content)
+            self._evict()
+        return parsed
+
+    def _parsed(self, key, meta, body, parse, fingerprint, force_write=False):
+        """저장된 파싱 결과 (없거나 다른 파서로 만든 결과면 저장된 본문을 다시 파싱)"""
+        if meta.get("parsed") is not None and meta.get("parser") == fingerprint:
+            if force_write:
+                with self._lock:
+                    self._write_meta(key, meta)
+            else:
+                # meta 파일 mtime이 _evict의 최근 사용 시각이므로 캐시만 읽은 경우에도 갱신
+                self._touch(key)
+            return meta["parsed"]
+
+        print("    🔁 [Cache] 파서 설정 변경 - 저장된 본문 재파싱")
+        meta["parsed"] = parse(CachedResponse(body, meta.get("encoding")))
+        meta["parser"] = fingerprint
+        with self._lock:
+            self._write_meta(key, meta)
+        return meta["parsed"]
+
+    def _touch(self, key):
+        meta_path, _ = self._paths(key)
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """총 용량이 max_bytes를 넘으면 오래 사용하지 않은 항목부터 삭제 (meta 파일 mtime = 마지막 사용)"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".body"):
+                continue
+            key = name[:-5]
+            meta_path, body_path = self._paths(key)
+            try:
+                size = os.path.getsize(body_path)
+                used_at = os.path.getmtime(meta_path)
+            except OSError:
+                continue
+            entries.append((used_at, key, size))
+            total += size
+
+        entries.sort()
+        for used_at, key, size in entries:
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+
+_cache = HttpCache()
+
+
+def fetch(url, parse, headers=None, params=None, max_age=0, fingerprint=None):
+    return _cache.fetch(url, parse, headers=headers, params=params, max_age=max_age,
+                        fingerprint=fingerprint)
+
+
+def stats():
+    return dict(_cache.stats)
@@ -0,0 +1,153 @@
+import os
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src import cassette, metrics
+
+# 기본 설정 (환경변수로 조정 가능)
+POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", "10"))  # 호스트별 풀 개수
+POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "10"))  # 호스트당 keep-alive 연결 수
+CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "15"))
+MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.environ.get("HTTP_BACKOFF_FACTOR", "0.5"))
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# 토큰 버킷으로 속도를 맞추는 API용: 상태 코드 재시도는 하지 않고 호출한 쪽(버킷 감속 + 다시 서명해 재요청)에 넘김
+# (urllib3는 Retry-After가 붙은 429를 status_forcelist와 상관없이 재시도하므로 헤더도 무시)
+RATE_LIMITED_RETRY_STATUS = ()
+
+
+class HttpClient:
+    """호스트별 keep-alive 연결 풀을 공유하는 HTTP 클라이언트"""
+
+    def __init__(self, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), max_retries=MAX_RETRIES,
+                 backoff_factor=BACKOFF_FACTOR, retry_status=RETRY_STATUS,
+                 respect_retry_after=True):
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        # retry_status(기본 429/5xx)는 지수 백오프로 재시도 (Retry-After 헤더 우선)
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=retry_status,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=respect_retry_after,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._adapters = [adapter]
+
+    def request(self, method, url, **kwargs):
+        """요청 실행 (timeout 미지정 시 기본 연결/읽기 타임아웃 적용)"""
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            tape = cassette.get()
+            if tape:
+                response = tape.http(
+                    method, url, kwargs.get("params"),
+                    lambda: self.session.request(method, url, **kwargs),
+                )
+            else:
+                response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            metrics.record_request(url, None, time.perf_counter() - start)
+            raise
+        metrics.record_request(url, response.status_code, time.perf_counter() - start,
+                               _retry_count(response))
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def stats(self):
+        """호스트별 신규 연결 수 / 재사용 요청 수"""
+        hosts = {}
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                opened = pool.num_connections
+                requests_sent = pool.num_requests
+                hosts[pool.host] = {
+                    "opened": opened,
+                    "requests": requests_sent,
+                    "reused": max(0, requests_sent - opened),
+                }
+        return {
+            "hosts": hosts,
+            "opened": sum(h["opened"] for h in hosts.values()),
+            "reused": sum(h["reused"] for h in hosts.values()),
+        }
+
+
+def _retry_count(response):
+    """urllib3가 내부에서 재시도한 횟수 (재생된 응답은 0)"""
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    return len(getattr(retries, "history", ()) or ())
+
+
+_CLIENT_OPTIONS = {
+    "default": {},
+    "rate_limited": {"retry_status": RATE_LIMITED_RETRY_STATUS, "respect_retry_after": False},
+}
+_clients = {}
+_client_lock = threading.Lock()
+
+
+def get_client(name="default"):
+    """프로세스 전체에서 공유하는 클라이언트 반환 (rate_limited: 429를 재시도하지 않음)"""
+    client = _clients.get(name)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = HttpClient(**_CLIENT_OPTIONS[name])
+    return client
+
+
+def get(url, client="default", **kwargs):
+    return get_client(client).get(url, **kwargs)
+
+
+def request(method, url, client="default", **kwargs):
+    return get_client(client).request(method, url, **kwargs)
+
+
+def stats():
+    """모든 클라이언트의 연결 재사용 현황 합계"""
+    hosts = {}
+    for client in list(_clients.values()) or [get_client()]:
+        for host, info in client.stats()["hosts"].items():
+            total = hosts.setdefault(host, {"opened": 0, "requests": 0, "reused": 0})
+            for key in total:
+                total[key] += info[key]
+    return {
+        "hosts": hosts,
+        "opened": sum(h["opened"] for h in hosts.values()),
+        "reused": sum(h["reused"] for h in hosts.values()),
+    }
+
+
+def print_stats():
+    """연결 재사용 현황 출력 (핸드셰이크 절감량)"""
+    data = stats()
+    print(f"    🔌 [HTTP] 신규 연결 {data['opened']}개 / 재사용 {data['reused']}회")
+    for host, info in sorted(data["hosts"].items()):
+        print(f"       - {host}: 요청 {info['requests']}회, 신규 연결 {info['opened']}개")
@@ -0,0 +1,171 @@
+"""키워드 지표 캐시 (검색량, 연관 키워드, 블로그 문서수, 자동완성)
+
+KEYWORD_CACHE_PATH           : SQLite 파일 경로
+KEYWORD_CACHE_<지표>_TTL_HOURS : 지표별 유효시간 (VOLUME, RELATED, BLOG, AUTOCOMPLETE)
+KEYWORD_CACHE_MAX_ENTRIES    : 최대 항목 수 (넘으면 오래 쓰지 않은 항목부터 삭제)
+KEYWORD_CACHE_REFRESH        : 캐시를 읽지 않고 새로 조회 ("1"/"all" 또는 "volume,blog"처럼 지표 목록)
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from src import cassette
+
+DB_PATH = os.environ.get("KEYWORD_CACHE_PATH", ".cache/keyword_metrics.db")
+MAX_ENTRIES = int(os.environ.get("KEYWORD_CACHE_MAX_ENTRIES", "200000"))
+
+# 월간 검색량은 월 단위 집계라 길게, 블로그 문서수는 매일 늘어나서 짧게
+DEFAULT_TTL_HOURS = {
+    "volume": 72,
+    "related": 72,
+    "blog": 12,
+    "autocomplete": 24,
+}
+TTL_SECONDS = {
+    metric: float(os.environ.get(f"KEYWORD_CACHE_{metric.upper()}_TTL_HOURS", str(hours))) * 3600
+    for metric, hours in DEFAULT_TTL_HOURS.items()
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keyword_metrics (
+    metric TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (metric, keyword)
+);
+CREATE INDEX IF NOT EXISTS idx_keyword_metrics_accessed ON keyword_metrics(accessed_at);
+"""
+
+
+def _refresh_metrics():
+    value = os.environ.get("KEYWORD_CACHE_REFRESH", "").strip().lower()
+    if value in ("1", "all", "true"):
+        return set(DEFAULT_TTL_HOURS)
+    return {m.strip() for m in value.split(",") if m.strip()}
+
+
+class KeywordCache:
+    """지표별 TTL이 있는 키워드 단위 캐시"""
+
+    def __init__(self, path=DB_PATH, ttl=None, max_entries=MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.ttl = dict(TTL_SECONDS, **(ttl or {}))
+        self.max_entries = max_entries
+        self.refresh = _refresh_metrics()
+        self.stats = {metric: {"hits": 0, "misses": 0, "stored": 0} for metric in self.ttl}
+        self.evicted = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, metric, keywords):
+        """-> ({키워드: 값} 캐시 적중분, 캐시에 없거나 만료된 키워드 목록)"""
+        stats = self.stats[metric]
+        if metric in self.refresh:
+            stats["misses"] += len(keywords)
+            return {}, list(keywords)
+
+        now = time.time()
+        found, missing = {}, []
+        with self._lock, self.conn:
+            for keyword in keywords:
+                row = self.conn.execute(
+                    "SELECT value, created_at FROM keyword_metrics WHERE metric = ? AND keyword = ?",
+                    (metric, keyword),
+                ).fetchone()
+                if row and now - row[1] < self.ttl[metric]:
+                    self.conn.execute(
+                        "UPDATE keyword_metrics SET accessed_at = ? WHERE metric = ? AND keyword = ?",
+                        (now, metric, keyword),
+                    )
+                    found[keyword] = json.loads(row[0])
+                else:
+                    missing.append(keyword)
+        stats["hits"] += len(found)
+        stats["misses"] += len(missing)
+        return found, missing
+
+    def get(self, metric, keyword):
+        """단일 키워드 조회 (없으면 None)"""
+        found, _ = self.get_many(metric, [keyword])
+        return found.get(keyword)
+
+    def put_many(self, metric, mapping):
+        if not mapping:
+            return
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO keyword_metrics (metric, keyword, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(metric, kw, json.dumps(value, ensure_ascii=False), now, now)
+                 for kw, value in mapping.items()],
+            )
+            self.stats[metric]["stored"] += len(mapping)
+            self._evict(now)
+
+    def put(self, metric, keyword, value):
+        self.put_many(metric, {keyword: value})
+
+    def _evict(self, now):
+        """지표별 만료 항목 삭제 후 최대 개수를 넘으면 오래 쓰지 않은 항목부터 삭제"""
+        for metric, ttl in self.ttl.items():
+            cursor = self.conn.execute(
+                "DELETE FROM keyword_metrics WHERE metric = ? AND created_at < ?", (metric, now - ttl)
+            )
+            self.evicted += cursor.rowcount
+        count = self.conn.execute("SELECT COUNT(*) FROM keyword_metrics").fetchone()[0]
+        if count > self.max_entries:
+            cursor = self.conn.execute(
+                "DELETE FROM keyword_metrics WHERE rowid IN ("
+                "SELECT rowid FROM keyword_metrics ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            self.evicted += cursor.rowcount
+
+
+class _NullCache:
+    """녹화/재생 중에는 캐시 상태에 따라 호출이 달라지지 않도록 항상 미적중"""
+
+    def get_many(self, metric, keywords):
+        return {}, list(keywords)
+
+    def get(self, metric, keyword):
+        return None
+
+    def put_many(self, metric, mapping):
+        pass
+
+    def put(self, metric, keyword, value):
+        pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if cassette.active():
+        return _NullCache()
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = KeywordCache()
+    return _cache
+
+
+def stats():
+    return {metric: dict(data) for metric, data in _cache.stats.items()} if _cache else {}
+
+
+def print_stats():
+    data = stats()
+    used = {metric: s for metric, s in data.items() if s["hits"] or s["misses"]}
+    if not used:
+        return
+    summary = ", ".join(f"{metric} {s['hits']}/{s['hits'] + s['misses']}" for metric, s in used.items())
+    print(f"    🗃️  [Keyword Cache] 적중 {summary} (삭제 {_cache.evicted}개)")
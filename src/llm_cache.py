@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from src.textutil import normalize_headline
+
+DB_PATH = os.environ.get("LLM_CACHE_PATH", ".cache/llm_cache.db")
+TTL_SECONDS = float(os.environ.get("LLM_CACHE_TTL_DAYS", "7")) * 86400
+MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keyword_cache (
+    key TEXT PRIMARY KEY,
+    keywords TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_keyword_cache_accessed ON keyword_cache(accessed_at);
+"""
+
+
+class LLMCache:
+    """헤드라인 단위 키워드 추출 결과 캐시 (정규화 헤드라인 + 모델 + 프롬프트 버전 해시)"""
+
+    def __init__(self, path=DB_PATH, ttl=TTL_SECONDS, max_entries=MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stored": 0, "evicted": 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(headline, model, prompt_version):
+        raw = f"{model}\n{prompt_version}\n{normalize_headline(headline)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def lookup(self, headlines, model, prompt_version):
+        """-> ({헤드라인: 키워드} 캐시 적중분, 캐시에 없는 헤드라인 목록)"""
+        now = time.time()
+        cached = {}
+        missing = []
+        with self._lock, self.conn:
+            for headline in headlines:
+                key = self.make_key(headline, model, prompt_version)
+                row = self.conn.execute(
+                    "SELECT keywords, created_at FROM keyword_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[1] < self.ttl:
+                    self.conn.execute(
+                        "UPDATE keyword_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+                    cached[headline] = json.loads(row[0])
+                    self.stats["hits"] += 1
+                else:
+                    if row:
+                        self.stats["expired"] += 1
+                    missing.append(headline)
+                    self.stats["misses"] += 1
+        return cached, missing
+
+    def store(self, mapping, model, prompt_version):
+        now = time.time()
+        with self._lock, self.conn:
+            for headline, keywords in mapping.items():
+                if headline is None:
+                    continue
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO keyword_cache (key, keywords, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.make_key(headline, model, prompt_version),
+                     json.dumps(keywords, ensure_ascii=False), now, now),
+                )
+                self.stats["stored"] += 1
+            self._evict(now)
+
+    def _evict(self, now):
+        """만료 항목 삭제 후 최대 개수를 넘으면 오래 쓰지 않은 항목부터 삭제"""
+        cursor = self.conn.execute(
+            "DELETE FROM keyword_cache WHERE created_at < ?", (now - self.ttl,)
+        )
+        self.stats["evicted"] += cursor.rowcount
+        count = self.conn.execute("SELECT COUNT(*) FROM keyword_cache").fetchone()[0]
+        if count > self.max_entries:
+            cursor = self.conn.execute(
+                "DELETE FROM keyword_cache WHERE key IN ("
+                "SELECT key FROM keyword_cache ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            self.stats["evicted"] += cursor.rowcount
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache()
+    return _cache
+
+
+def stats():
+    return dict(_cache.stats) if _cache else {}
+
+
+def print_stats():
+    data = stats()
+    if not data:
+        return
+    total = data["hits"] + data["misses"]
+    rate = data["hits"] / total * 100 if total else 0
+    print(f"    🧠 [LLM Cache] 적중 {data['hits']}개 / 미적중 {data['misses']}개 "
+          f"(적중률 {rate:.0f}%, 만료 {data['expired']}개, 삭제 {data['evicted']}개)")
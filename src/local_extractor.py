@@ -0,0 +1,129 @@
+import re
+import math
+from src.textutil import strip_source, strip_inline_tags
+
+# 조사/어미 (긴 것부터 검사)
+JOSA = sorted([
+    "에서는", "으로는", "에게서", "까지는", "이라는", "이라고",
+    "에서", "으로", "에게", "한테", "까지", "부터", "처럼", "보다", "이나", "라는", "라고",
+    "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만", "께",
+], key=len, reverse=True)
+
+# 블로그 키워드로 쓸모없는 일반 단어
+STOPWORDS = {
+    "뉴스", "오늘", "발표", "속보", "단독", "종합", "포토", "영상", "사진", "기자",
+    "내일", "어제", "올해", "지난", "이번", "관련", "대한", "위해", "통해", "밝혀",
+    "있다", "없다", "했다", "한다", "된다", "이다", "것", "등", "및", "더", "또",
+}
+
+# 서술어로 끝나는 단어 (키워드 후보에서 제외)
+VERB_ENDINGS = ("다", "려", "며", "고", "해", "돼", "져", "서", "나", "까")
+
+_TOKEN = re.compile(r"[0-9A-Za-z가-힣]+")
+# 쉼표, 말줄임표, 따옴표 등 구절 경계 (복합명사를 이 경계 너머로 잇지 않음)
+_SEGMENT = re.compile(r"[,·…\.\?!'\"‘’“”:;/|~\-]+")
+
+
+def _strip_josa(word):
+    for josa in JOSA:
+        if word.endswith(josa) and len(word) - len(josa) >= 2:
+            word = word[:-len(josa)]
+            break
+    if word.endswith("들") and len(word) >= 3:
+        word = word[:-1]
+    return word
+
+
+def _segments(headline):
+    """헤드라인 -> 구절별로 조사를 뗀 단어 목록"""
+    text = strip_inline_tags(strip_source(headline))
+    segments = []
+    for part in _SEGMENT.split(text):
+        words = []
+        for token in _TOKEN.findall(part):
+            if token.endswith(VERB_ENDINGS) and len(token) <= 4:
+                continue
+            word = _strip_josa(token)
+            if len(word) >= 2 and word not in STOPWORDS and not word.isdigit():
+                words.append(word)
+        if words:
+            segments.append(words)
+    return segments
+
+
+def _words(headline):
+    return [word for segment in _segments(headline) for word in segment]
+
+
+def _candidates(headline):
+    """단어와, 같은 구절 안에서 인접 단어를 붙인 복합명사 후보"""
+    candidates = set()
+    for words in _segments(headline):
+        candidates.update(words)
+        for a, b in zip(words, words[1:]):
+            compound = a + b
+            if len(compound) <= 12:
+                candidates.add(compound)
+    return candidates
+
+
+def score_candidates(headlines):
+    """후보 키워드별 점수 (여러 헤드라인에 등장할수록, 복합명사일수록 높음)
+
+    문서 빈도는 띄어쓰기 차이를 흡수하도록 공백을 뺀 헤드라인 안의
+    글자열 포함 여부로 센다.
+    """
+    docs = [_words(h) for h in headlines]
+    joined = ["".join(words) for words in docs]
+    n_docs = max(len(docs), 1)
+
+    scores = {}
+    for headline, words in zip(headlines, docs):
+        for cand in _candidates(headline):
+            if cand in scores:
+                continue
+            df = sum(1 for text in joined if cand in text)
+            # 흔한 단어일수록 IDF가 낮아지지만, 여러 기사에 나온 이슈는 가산
+            idf = math.log(1 + n_docs / df)
+            is_compound = cand not in words
+            length_bonus = min(len(cand), 8) / 4
+            scores[cand] = df * idf * length_bonus * (1.3 if is_compound else 1.0)
+    return scores
+
+
+def extract_keywords_by_headline(headlines, per_headline=3, scores=None):
+    """헤드라인별 상위 키워드 -> {헤드라인: [키워드]} (네트워크 호출 없음)"""
+    scores = scores or score_candidates(headlines)
+    mapping = {}
+    for headline in headlines:
+        ranked = sorted(_candidates(headline), key=lambda c: (-scores.get(c, 0), c))
+        picked = []
+        for cand in ranked:
+            # 이미 고른 키워드에 포함되는 짧은 후보는 건너뜀
+            if any(cand in p for p in picked):
+                continue
+            picked.append(cand)
+            if len(picked) >= per_headline:
+                break
+        mapping[headline] = picked
+    return mapping
+
+
+def extract_keywords(headlines, per_headline=3):
+    """헤드라인 전체에서 점수순 키워드 목록"""
+    scores = score_candidates(headlines)
+    mapping = extract_keywords_by_headline(headlines, per_headline, scores)
+    keywords = {kw for kws in mapping.values() for kw in kws}
+    return sorted(keywords, key=lambda k: (-scores.get(k, 0), k))
+
+
+def rank_headlines(headlines, limit):
+    """키워드 점수 합이 높은 헤드라인 상위 limit개 (LLM 전송 대상 축소용)"""
+    scores = score_candidates(headlines)
+    mapping = extract_keywords_by_headline(headlines, scores=scores)
+    ranked = sorted(
+        headlines,
+        key=lambda h: sum(scores.get(k, 0) for k in mapping[h]),
+        reverse=True,
+    )
+    return ranked[:limit]
@@ -0,0 +1,186 @@
+"""실행 단위 계측 (단계별 소요시간, 호스트별 요청 수/지연시간, 재시도, 캐시 적중)
+
+매 실행마다 output/metrics.json에 결과를 쓰고, output/metrics_history.jsonl에
+한 줄씩 추가해서 최근 METRICS_HISTORY_SIZE회(기본 200회) 추이를 남긴다.
+"""
+import os
+import json
+import time
+import threading
+from datetime import datetime, timezone, timedelta
+from urllib.parse import urlsplit
+
+METRICS_PATH = os.environ.get("METRICS_PATH", "output/metrics.json")
+HISTORY_PATH = os.environ.get("METRICS_HISTORY_PATH", "output/metrics_history.jsonl")
+HISTORY_SIZE = int(os.environ.get("METRICS_HISTORY_SIZE", "200"))
+
+# 지연시간 히스토그램 구간 상한(ms)
+BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+KST = timezone(timedelta(hours=9))
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def to_dict(self):
+        count = sum(self.counts)
+        labels = [f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {
+            "count": count,
+            "avg_ms": round(self.total_ms / count, 1) if count else 0,
+            "max_ms": round(self.max_ms, 1),
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+class RunMetrics:
+    def __init__(self):
+        self.started_at = time.time()
+        self.stages = []
+        self._current = None
+        self.hosts = {}
+        self.notes = {}
+        self._lock = threading.Lock()
+
+    # ----- 단계 -----
+
+    def stage(self, name):
+        """새 단계 시작 (이전 단계는 여기서 끝난 것으로 기록)"""
+        now = time.perf_counter()
+        self._end_stage(now)
+        self._current = (name, now)
+
+    def _end_stage(self, now):
+        if self._current:
+            name, start = self._current
+            self.stages.append({"stage": name, "seconds": round(now - start, 3)})
+            self._current = None
+
+    # ----- HTTP -----
+
+    def record_request(self, url, status, elapsed, retries=0):
+        host = urlsplit(url).hostname or url
+        with self._lock:
+            data = self.hosts.get(host)
+            if data is None:
+                data = self.hosts[host] = {"requests": 0, "errors": 0, "retries": 0,
+                                           "status": {}, "latency": Histogram()}
+            data["requests"] += 1
+            data["retries"] += retries
+            key = str(status) if status else "error"
+            data["status"][key] = data["status"].get(key, 0) + 1
+            if not status or status >= 400:
+                data["errors"] += 1
+            data["latency"].add(elapsed * 1000)
+
+    def note(self, key, value):
+        """실행 요약 값 기록 (헤드라인 수, 키워드 수 등)"""
+        self.notes[key] = value
+
+    def snapshot(self, status):
+        self._end_stage(time.perf_counter())
+        hosts = {
+            host: dict(data, latency=data["latency"].to_dict())
+            for host, data in sorted(self.hosts.items())
+        }
+        return {
+            "run_at": datetime.fromtimestamp(self.started_at, KST).isoformat(timespec="seconds"),
+            "status": status,
+            "total_seconds": round(time.time() - self.started_at, 3),
+            "stages": self.stages,
+            "summary": self.notes,
+            "http": hosts,
+            **_collect_components(),
+        }
+
+
+def _collect_components():
+    """각 모듈이 모아 둔 통계 (import 순환을 피하려고 기록 시점에 가져옴)"""
+    from src import analyzer, crawler, http_cache, llm_cache, keyword_cache, rate_limit, autocomplete, assets
+
+    llm = {}
+    for attempt in analyzer.ATTEMPTS:
+        data = llm.setdefault(attempt["provider"], {"attempts": 0, "ok": 0, "retries": 0,
+                                                    "latency": Histogram()})
+        data["attempts"] += 1
+        data["ok"] += attempt["outcome"] == "ok"
+        data["retries"] += attempt["attempt"] > 1
+        data["latency"].add(attempt["latency_ms"])
+    for data in llm.values():
+        data["latency"] = data["latency"].to_dict()
+
+    return {
+        "sources": crawler.SOURCE_METRICS,
+        "llm": llm,
+        "rate_limit": rate_limit.stats(),
+        "assets": assets.stats(),
+        "cache": {
+            "http": http_cache.stats(),
+            "llm": llm_cache.stats(),
+            "keyword": keyword_cache.stats(),
+            "autocomplete": {k: autocomplete.STATS[k] for k in ("requests", "cache_hits")}
+            if autocomplete.STATS else {},
+        },
+    }
+
+
+_run = RunMetrics()
+
+
+def stage(name):
+    _run.stage(name)
+
+
+def record_request(url, status, elapsed, retries=0):
+    _run.record_request(url, status, elapsed, retries)
+
+
+def note(key, value):
+    _run.note(key, value)
+
+
+def write(status="ok", path=METRICS_PATH, history_path=HISTORY_PATH, history_size=HISTORY_SIZE):
+    """이번 실행 지표 저장 + 이력 파일에 추가 (최근 history_size회만 유지)"""
+    data = _run.snapshot(status)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    # 이력에는 추이 비교에 필요한 값만 남김
+    line = json.dumps({
+        "run_at": data["run_at"],
+        "status": status,
+        "total_seconds": data["total_seconds"],
+        "stages": {s["stage"]: s["seconds"] for s in data["stages"]},
+        "requests": {host: h["requests"] for host, h in data["http"].items()},
+        "errors": sum(h["errors"] for h in data["http"].values()),
+        "retries": sum(h["retries"] for h in data["http"].values()),
+        **data["summary"],
+    }, ensure_ascii=False)
+
+    lines = []
+    if os.path.exists(history_path):
+        with open(history_path, "r", encoding="utf-8") as f:
+            lines = [l.rstrip("\n") for l in f if l.strip()]
+    lines = (lines + [line])[-history_size:]
+    tmp_path = history_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, history_path)
+
+    print(f"    📈 [Metrics] {path} 저장 (총 {data['total_seconds']:.1f}초)")
+    return data
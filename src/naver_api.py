@@ -4,17 +4,146 @@ import hashlib
 import hmac
 import base64
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from src import http_client, cassette, rate_limit, keyword_cache, autocomplete
+
+AD_API_URL = "https://api.naver.com"
+KEYWORDSTOOL_URI = "/keywordstool"
+
+# 검색량 배치 동시 요청 수 / 배치당 최대 시도 횟수
+VOLUME_CONCURRENCY = int(os.environ.get("NAVER_AD_CONCURRENCY", "3"))
+VOLUME_MAX_ATTEMPTS = int(os.environ.get("NAVER_AD_MAX_ATTEMPTS", "4"))
+# 블로그 문서수 동시 요청 수 / 429·5xx 재시도 포함 최대 시도 횟수
+BLOG_CONCURRENCY = int(os.environ.get("NAVER_SEARCH_CONCURRENCY", "8"))
+BLOG_MAX_ATTEMPTS = int(os.environ.get("NAVER_SEARCH_MAX_ATTEMPTS", "4"))
+# 블로그 문서수 조회 예산 (캐시 적중 제외 API 호출 수)
+BLOG_CALL_BUDGET = int(os.environ.get("NAVER_BLOG_CALL_BUDGET", "100"))
+# 리포트 기준 (builder: 포화도 1.5 이하 TOP 50)이 확정되면 조회 조기 종료
+BLOG_TARGET_KEYWORDS = int(os.environ.get("NAVER_BLOG_TARGET_KEYWORDS", "50"))
+BLOG_TARGET_SATURATION = float(os.environ.get("NAVER_BLOG_TARGET_SATURATION", "1.5"))
+# 키워드 문서수가 항상 이 값 이상이라고 확신할 때만 설정 (미설정이면 예산까지 조회, 조기 종료 없음)
+BLOG_COUNT_FLOOR = os.environ.get("NAVER_BLOG_COUNT_FLOOR")
+
+
+class RetryableBatchError(Exception):
+    """다시 시도하면 성공할 수 있는 검색량 조회 실패 (429, 5xx, 네트워크 오류)"""
+
+
+class BlogCountError(Exception):
+    """블로그 문서수 조회 실패 (0으로 취급하지 않고 결과에서 제외)"""
+
+
+class VolumeBatchPlanner:
+    """검색량 조회 배치 계획
+
+    keywordstool 응답에는 힌트 외의 연관 키워드 검색량도 함께 들어오므로,
+    배치를 보내기 직전에 이미 결과에 있는 키워드를 빼고 5개씩 다시 묶는다.
+    결과(results)는 호출한 스레드에서만 갱신한다.
+    """
+
+    def __init__(self, fetch, executor, results, concurrency=VOLUME_CONCURRENCY):
+        self.fetch = fetch
+        self.executor = executor
+        self.results = results
+        self.concurrency = concurrency
+        self.queue = deque()
+        self.attempts = {}
+        self.pending = {}
+        self.batches = 0
+        self.skipped = 0
+        self.failed = []
+
+    def add(self, keyword):
+        """조회할 키워드 추가 (5개가 모이고 자리가 있으면 바로 전송)"""
+        self._collect(block=False)
+        if keyword in self.results:
+            self.skipped += 1
+            return
+        self.queue.append(keyword)
+        self._dispatch(flush=False)
+
+    def finish(self):
+        """남은 키워드를 모두 보내고 결과가 다 모일 때까지 대기"""
+        while self.queue or self.pending:
+            self._dispatch(flush=True)
+            if self.pending:
+                self._collect(block=True)
+        if self.batches or self.skipped:
+            print(f"    📦 [NaverAPI] 검색량 배치 {self.batches}회 전송, "
+                  f"이미 조회된 키워드 {self.skipped}개 건너뜀")
+        if self.failed:
+            print(f"    ⚠️ [NaverAPI] 검색량 조회 실패 키워드 {len(self.failed)}개")
+
+    def _unresolved(self):
+        return [kw for kw in self.queue if kw not in self.results]
+
+    def _take_batch(self):
+        batch = []
+        while self.queue and len(batch) < 5:
+            keyword = self.queue.popleft()
+            if keyword in self.results:
+                self.skipped += 1
+            elif keyword not in batch:
+                batch.append(keyword)
+        return batch
+
+    def _dispatch(self, flush):
+        while len(self.pending) < self.concurrency:
+            if not flush and len(self._unresolved()) < 5:
+                return
+            batch = self._take_batch()
+            if not batch:
+                return
+            self.pending[self.executor.submit(self.fetch, batch)] = batch
+            self.batches += 1
+
+    def _collect(self, block):
+        """끝난 배치 결과 병합, 재시도 가능한 실패는 키워드를 큐 앞에 다시 넣음"""
+        if not self.pending:
+            return
+        done, _ = wait(list(self.pending), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            batch = self.pending.pop(future)
+            try:
+                self.results.update(future.result())
+            except RetryableBatchError as e:
+                retry = []
+                for keyword in batch:
+                    self.attempts[keyword] = self.attempts.get(keyword, 1) + 1
+                    if self.attempts[keyword] <= VOLUME_MAX_ATTEMPTS:
+                        retry.append(keyword)
+                    else:
+                        self.failed.append(keyword)
+                if retry:
+                    print(f"    🔁 [NaverAPI] {','.join(retry)} 다시 대기열에 추가: {e}")
+                else:
+                    print(f"    ⚠️ [NaverAPI] {','.join(batch)} 조회 포기: {e}")
+                self.queue.extendleft(reversed(retry))
+            except Exception as e:
+                # 예상하지 못한 오류는 이 배치만 실패로 두고 나머지 배치는 계속 진행
+                print(f"    ⚠️ [NaverAPI] {','.join(batch)} 조회 실패: {e}")
+                self.failed.extend(batch)
 
 
 class NaverAPI:
     """네이버 광고 API + 검색 API로 키워드 데이터 조회"""
     
     def __init__(self):
+        self.blog_requests = 0
         self.ad_client_id = os.environ.get("NAVER_AD_CLIENT_ID")
         self.ad_client_secret = os.environ.get("NAVER_AD_CLIENT_SECRET")
         self.ad_customer_id = os.environ.get("NAVER_AD_CUSTOMER_ID")
         self.search_client_id = os.environ.get("NAVER_CLIENT_ID")
         self.search_client_secret = os.environ.get("NAVER_CLIENT_SECRET")
+
+        if cassette.is_replay():
+            # 재생 모드는 실제 호출이 없으므로 키가 없어도 진행
+            self.ad_client_id = self.ad_client_id or "replay"
+            self.ad_client_secret = self.ad_client_secret or "replay"
+            self.ad_customer_id = self.ad_customer_id or "replay"
+            self.search_client_id = self.search_client_id or "replay"
+            self.search_client_secret = self.search_client_secret or "replay"
     
     def _get_header(self, method, uri):
         """광고 API 헤더 생성"""
@@ -34,83 +163,165 @@ class NaverAPI:
             "X-Signature": signature_base64,
         }
     
-    def get_search_volume(self, keywords):
-        """네이버 광고 API로 월간검색량 조회"""
-        if not all([self.ad_client_id, self.ad_client_secret, self.ad_customer_id]):
-            print("    ❌ [NaverAPI] 광고 API 키가 없습니다.")
-            return {}
-        
-        BASE_URL = "https://api.naver.com"
-        uri = "/keywordstool"
-        method = "GET"
+    def _has_ad_keys(self):
+        return all([self.ad_client_id, self.ad_client_secret, self.ad_customer_id])
+
+    @staticmethod
+    def _clean_keyword(keyword):
+        keyword = keyword.strip().replace(" ", "")
+        return keyword if len(keyword) > 1 else None
+
+    def _fetch_volume_batch(self, batch):
+        """키워드 최대 5개 검색량 조회 (연관 키워드 포함) -> {키워드: 월간검색량}
+
+        429/5xx/네트워크 오류는 RetryableBatchError로 알려서 다시 큐에 넣게 한다.
+        """
+        limiter = rate_limit.get("naver_ad")
+        limiter.acquire()
+
+        # 시도마다 새 타임스탬프로 서명 (429는 http_client가 재시도하지 않고 여기서 처리)
+        headers = self._get_header("GET", KEYWORDSTOOL_URI)
+        params = {
+            "hintKeywords": ",".join(batch),
+            "showDetail": "1"
+        }
         results = {}
         
-        for i in range(0, len(keywords), 5):
-            batch = keywords[i:i+5]
-            
-            cleaned_batch = []
-            for kw in batch:
-                kw = kw.strip().replace(" ", "")
-                if kw and len(kw) > 1:
-                    cleaned_batch.append(kw)
-            
-            if not cleaned_batch:
-                continue
-            
-            headers = self._get_header(method, uri)
-            params = {
-                "hintKeywords": ",".join(cleaned_batch),
-                "showDetail": "1"
-            }
-            
+        try:
+            response = http_client.get(AD_API_URL + KEYWORDSTOOL_URI, client="rate_limited",
+                                       headers=headers, params=params)
+        except requests.RequestException as e:
+            raise RetryableBatchError(f"요청 실패: {e}")
+
+        if response.status_code == 429:
+            limiter.throttle(rate_limit.retry_after(response))
+            raise RetryableBatchError("호출 한도 초과 (429)")
+        if response.status_code >= 500:
+            raise RetryableBatchError(f"서버 오류 ({response.status_code})")
+
+        if response.status_code == 200:
+            limiter.success()
             try:
-                response = requests.get(BASE_URL + uri, headers=headers, params=params)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    for item in data.get("keywordList", []):
-                        keyword = item.get("relKeyword", "")
-                        pc_volume = item.get("monthlyPcQcCnt", 0)
-                        mobile_volume = item.get("monthlyMobileQcCnt", 0)
+                data = response.json()
+                for item in data.get("keywordList", []):
+                    keyword = item.get("relKeyword", "")
+                    pc_volume = item.get("monthlyPcQcCnt", 0)
+                    mobile_volume = item.get("monthlyMobileQcCnt", 0)
+                    
+                    if isinstance(pc_volume, str):
+                        pc_volume = 10
+                    if isinstance(mobile_volume, str):
+                        mobile_volume = 10
                         
-                        if isinstance(pc_volume, str):
-                            pc_volume = 10
-                        if isinstance(mobile_volume, str):
-                            mobile_volume = 10
-                            
-                        results[keyword] = pc_volume + mobile_volume
-                else:
-                    print(f"    ⚠️ [NaverAPI] 일부 키워드 조회 실패: {response.status_code}")
-                    print(f"    ⚠️ [NaverAPI] 에러 내용: {response.text}")
-            except Exception as e:
-                print(f"    ⚠️ [NaverAPI] 요청 실패: {e}")
-            
-            time.sleep(0.2)
+                    results[keyword] = pc_volume + mobile_volume
+            except (ValueError, AttributeError, TypeError) as e:
+                # 점검 페이지 등 JSON이 아닌 200 응답
+                raise RetryableBatchError(f"응답 형식 오류: {e}")
+
+            # 응답 행은 힌트별로 나뉘지 않으므로 배치 전체 연관 키워드를 각 힌트에 저장
+            cache = keyword_cache.get_cache()
+            cache.put_many("volume", results)
+            cache.put_many("related", {hint: sorted(results) for hint in batch})
+        else:
+            print(f"    ⚠️ [NaverAPI] 일부 키워드 조회 실패: {response.status_code}")
+            print(f"    ⚠️ [NaverAPI] 에러 내용: {response.text}")
         
         return results
+
+    def _cached_volumes(self, keywords):
+        """캐시에 있는 힌트 키워드와 그 연관 키워드 검색량 -> ({키워드: 검색량}, 조회가 필요한 키워드)"""
+        cache = keyword_cache.get_cache()
+        related, missing = cache.get_many("related", keywords)
+        names = set(related) | {kw for rel in related.values() for kw in rel}
+        # 힌트로 조회한 적은 없어도 다른 배치의 연관 키워드로 검색량이 저장된 경우
+        volumes, _ = cache.get_many("volume", sorted(names | set(missing)))
+        return volumes, [kw for kw in missing if kw not in volumes]
     
+    def get_search_volume(self, keywords):
+        """네이버 광고 API로 월간검색량 조회 (배치를 동시에 요청, 속도는 토큰 버킷으로 제한)"""
+        if not self._has_ad_keys():
+            print("    ❌ [NaverAPI] 광고 API 키가 없습니다.")
+            return {}
+        
+        cleaned = list(dict.fromkeys(kw for kw in map(self._clean_keyword, keywords) if kw))
+        results, missing = self._cached_volumes(cleaned)
+        if len(missing) < len(cleaned):
+            print(f"    🗃️  [NaverAPI] 검색량 캐시 사용 {len(cleaned) - len(missing)}개, 조회 필요 {len(missing)}개")
+
+        with ThreadPoolExecutor(max_workers=VOLUME_CONCURRENCY) as executor:
+            planner = VolumeBatchPlanner(self._fetch_volume_batch, executor, results)
+            for keyword in missing:
+                planner.add(keyword)
+            planner.finish()
+        return results
+    
+    def _has_search_keys(self):
+        return all([self.search_client_id, self.search_client_secret])
+
     def get_blog_count(self, keyword):
-        """네이버 검색 API로 블로그 문서수 조회"""
-        if not all([self.search_client_id, self.search_client_secret]):
-            return 0
+        """네이버 검색 API로 블로그 문서수 조회 (실패하면 BlogCountError)"""
+        if not self._has_search_keys():
+            raise BlogCountError("검색 API 키가 없습니다")
         
         headers = {
             "X-Naver-Client-Id": self.search_client_id,
             "X-Naver-Client-Secret": self.search_client_secret
         }
         params = {"query": keyword, "display": 1}
+        limiter = rate_limit.get("naver_search")
         
-        try:
-            response = requests.get(
-                "https://openapi.naver.com/v1/search/blog.json",
-                headers=headers,
-                params=params
-            )
-            if response.status_code == 200:
-                return response.json().get("total", 0)
-            return 0
-        except:
-            return 0
+        for attempt in range(1, BLOG_MAX_ATTEMPTS + 1):
+            limiter.acquire()
+            try:
+                response = http_client.get(
+                    "https://openapi.naver.com/v1/search/blog.json",
+                    client="rate_limited",
+                    headers=headers,
+                    params=params
+                )
+            except requests.RequestException as e:
+                raise BlogCountError(f"요청 실패: {e}")
+
+            if response.status_code == 429:
+                limiter.throttle(rate_limit.retry_after(response))
+                continue
+            if response.status_code >= 500 and attempt < BLOG_MAX_ATTEMPTS:
+                continue
+            if response.status_code != 200:
+                raise BlogCountError(f"HTTP {response.status_code}: {response.text[:100]}")
+
+            limiter.success()
+            try:
+                return int(response.json()["total"])
+            except (ValueError, KeyError, TypeError) as e:
+                raise BlogCountError(f"응답 형식 오류: {e}")
+
+        raise BlogCountError(f"호출 한도 초과 (429, {BLOG_MAX_ATTEMPTS}회 시도)")
+
+    def get_blog_counts(self, keywords):
+        """여러 키워드의 블로그 문서수를 동시에 조회 -> ({키워드: 문서수}, {키워드: 에러})
+
+        실패한 키워드는 0으로 채우지 않고 에러 목록으로 돌려준다.
+        """
+        if not self._has_search_keys():
+            print("    ❌ [NaverAPI] 검색 API 키가 없습니다.")
+            return {}, {kw: "검색 API 키가 없습니다" for kw in keywords}
+
+        cache = keyword_cache.get_cache()
+        counts, missing = cache.get_many("blog", keywords)
+        self.blog_requests += len(missing)
+        errors = {}
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=BLOG_CONCURRENCY) as executor:
+            futures = {executor.submit(self.get_blog_count, kw): kw for kw in missing}
+            for future, keyword in futures.items():
+                try:
+                    fetched[keyword] = future.result()
+                except BlogCountError as e:
+                    errors[keyword] = str(e)
+        cache.put_many("blog", fetched)
+        counts.update(fetched)
+        return counts, errors
     
     def analyze_keywords(self, keywords):
         """키워드 분석: 검색량, 문서수, 포화도 계산"""
@@ -120,17 +331,126 @@ class NaverAPI:
         search_volumes = self.get_search_volume(keywords)
         print(f"    ✅ {len(search_volumes)}개 키워드 검색량 조회 완료")
         
-        sorted_keywords = sorted(search_volumes.items(), key=lambda x: x[1], reverse=True)[:100]
-        
-        print(f"    📝 블로그 문서수 조회 중... (상위 {len(sorted_keywords)}개)")
+        return self._analyze_volumes(search_volumes)
+
+    def analyze_keyword_stream(self, keywords):
+        """키워드가 들어오는 대로 5개씩 검색량 조회를 시작 (LLM 생성과 겹쳐 실행)
+
+        keywords는 생성기여도 되며 끝까지 소비한다. 받은 키워드 수는
+        self.received_keywords에 남긴다.
+        """
+        print("    📊 [NaverAPI] 키워드 수신 즉시 검색량 조회 시작...")
+        has_keys = self._has_ad_keys()
+        if not has_keys:
+            print("    ❌ [NaverAPI] 광고 API 키가 없습니다.")
+
+        seen = set()
+        search_volumes = {}
+        # LLM 응답을 기다리는 동안 채워진 배치부터 조회 (속도는 토큰 버킷이 조절)
+        with ThreadPoolExecutor(max_workers=VOLUME_CONCURRENCY) as executor:
+            planner = VolumeBatchPlanner(self._fetch_volume_batch, executor, search_volumes)
+            for keyword in keywords:
+                keyword = self._clean_keyword(keyword)
+                if not keyword or keyword in seen:
+                    continue
+                seen.add(keyword)
+                if keyword in search_volumes:
+                    planner.skipped += 1
+                    continue
+                cached, missing = self._cached_volumes([keyword])
+                search_volumes.update(cached)
+                if missing and has_keys:
+                    planner.add(keyword)
+            planner.finish()
+
+        self.received_keywords = len(seen)
+        print(f"    ✅ {len(seen)}개 키워드 수신, {len(search_volumes)}개 키워드 검색량 조회 완료")
+        return self._analyze_volumes(search_volumes)
+
+    def _schedule_blog_counts(self, search_volumes):
+        """검색량 높은 순으로 블로그 문서수를 조회 (호출 예산 안에서)
+
+        기본은 검색량 상위 BLOG_CALL_BUDGET개를 한 번에 동시 조회한다. 문서수는 0에
+        가까울 수 있어 조회 전에는 포화도 하한을 알 수 없기 때문이다.
+        NAVER_BLOG_COUNT_FLOOR를 설정한 경우에만 BLOG_CONCURRENCY개씩 나눠 조회하며,
+        남은 후보의 포화도가 floor / 검색량 이상이라고 보고 그 하한이 리포트 기준
+        (포화도 1.5 이하)을 넘거나 이미 채운 TOP 50의 50번째보다 낮아질 수 없으면
+        조회를 멈춘다.
+        -> ({키워드: 문서수}, {키워드: 에러}, 중단 사유)
+        """
+        candidates = [kw for kw, volume in sorted(search_volumes.items(), key=lambda x: x[1], reverse=True)
+                      if volume > 0]
+        if not self._has_search_keys():
+            print("    ❌ [NaverAPI] 검색 API 키가 없습니다.")
+            return {}, {}, (None, len(candidates), 0)
+
+        counts, errors = {}, {}
+        qualified = []  # 기준을 만족한 키워드의 포화도
+        floor = float(BLOG_COUNT_FLOOR) if BLOG_COUNT_FLOOR else None
+        start_requests = self.blog_requests
+        stopped = None
+
+        if floor is None:
+            # 조기 종료가 없으면 나눠 보낼 이유가 없으므로 예산만큼을 한 번에 풀에 넣음
+            targets = candidates[:BLOG_CALL_BUDGET]
+            counts, errors = self.get_blog_counts(targets)
+            skipped = len(candidates) - len(targets)
+            return counts, errors, ("budget" if skipped else None, skipped, self.blog_requests - start_requests)
+
+        position = 0
+        while position < len(candidates):
+            remaining_budget = BLOG_CALL_BUDGET - (self.blog_requests - start_requests)
+            if remaining_budget <= 0:
+                stopped = "budget"
+                break
+
+            if floor is not None:
+                bound = floor / search_volumes[candidates[position]]
+                if bound > BLOG_TARGET_SATURATION:
+                    stopped = "threshold"
+                    break
+                if len(qualified) >= BLOG_TARGET_KEYWORDS:
+                    cutoff = sorted(qualified)[BLOG_TARGET_KEYWORDS - 1]
+                    if bound >= cutoff:
+                        stopped = "confirmed"
+                        break
+
+            wave = candidates[position:position + min(BLOG_CONCURRENCY, remaining_budget)]
+            position += len(wave)
+            found, failed = self.get_blog_counts(wave)
+            counts.update(found)
+            errors.update(failed)
+            for keyword, blog_count in found.items():
+                saturation = blog_count / search_volumes[keyword]
+                if saturation <= BLOG_TARGET_SATURATION:
+                    qualified.append(saturation)
+
+        skipped = len(candidates) - position
+        return counts, errors, (stopped, skipped, self.blog_requests - start_requests)
+
+    def _analyze_volumes(self, search_volumes):
+        """검색량 상위 키워드의 블로그 문서수와 포화도 계산"""
+        print(f"    📝 블로그 문서수 조회 중... (검색량 순, 예산 {BLOG_CALL_BUDGET}회)")
+        start = time.perf_counter()
+        blog_counts, errors, (stopped, skipped, calls) = self._schedule_blog_counts(search_volumes)
+        elapsed = time.perf_counter() - start
+        print(f"    ⏱️  블로그 문서수 조회 {elapsed:.1f}초 (API {calls}회, 성공 {len(blog_counts)}개, 실패 {len(errors)}개)")
+        if stopped:
+            reason = {
+                "budget": "호출 예산 소진",
+                "threshold": f"남은 후보는 포화도 {BLOG_TARGET_SATURATION} 이하 불가",
+                "confirmed": f"TOP {BLOG_TARGET_KEYWORDS} 확정",
+            }[stopped]
+            print(f"    ✂️  {reason} - 나머지 {skipped}개 조회 생략")
+        for keyword, error in list(errors.items())[:5]:
+            print(f"    ⚠️ [NaverAPI] '{keyword}' 문서수 조회 실패: {error}")
+        if len(errors) > 5:
+            print(f"    ⚠️ [NaverAPI] ... 외 {len(errors) - 5}개 실패 (결과에서 제외)")
+
         results = []
         
-        for keyword, volume in sorted_keywords:
-            if volume == 0:
-                continue
-            
-            blog_count = self.get_blog_count(keyword)
-            time.sleep(0.05)
+        for keyword, blog_count in blog_counts.items():
+            volume = search_volumes[keyword]
             
             saturation = round(blog_count / volume, 2) if volume > 0 else 999
             
@@ -157,26 +477,5 @@ class NaverAPI:
         return results
     
     def get_autocomplete(self, keyword):
-        """네이버 자동완성으로 연관검색어 조회"""
-        url = "https://mac.search.naver.com/mobile/ac"
-        params = {
-            "q": keyword,
-            "st": "1",
-            "r_format": "json",
-            "r_enc": "UTF-8",
-            "r_unicode": "0",
-            "t_koreng": "1"
-        }
-        
-        try:
-            response = requests.get(url, params=params, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get("items", [[]])[0]
-                # 자기 자신 제외하고 5개 반환
-                results = [item[0] for item in items if item[0] != keyword][:5]
-                return results
-        except:
-            pass
-        return []
-
+        """네이버 자동완성으로 연관검색어 조회 (상위 5개)"""
+        return autocomplete.suggest(keyword)[:5]
@@ -0,0 +1,112 @@
+"""API별 호출 속도 제한 (토큰 버킷)
+
+NAVER_AD_RPS     : 광고 API(keywordstool) 초당 호출 수 (기본 5)
+NAVER_SEARCH_RPS : 검색 API(openapi.naver.com) 초당 호출 수 (기본 10)
+
+429를 받으면 속도를 절반으로 낮추고 Retry-After 동안 멈췄다가,
+성공할 때마다 조금씩 원래 속도로 되돌린다.
+"""
+import os
+import time
+import threading
+from src import cassette
+
+LIMITS = {
+    "naver_ad": float(os.environ.get("NAVER_AD_RPS", "5")),
+    "naver_search": float(os.environ.get("NAVER_SEARCH_RPS", "10")),
+}
+
+
+class TokenBucket:
+    """스레드 간에 공유하는 토큰 버킷"""
+
+    def __init__(self, name, rate, burst=None):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = rate / 8
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.stats = {"acquired": 0, "waited": 0.0, "throttled": 0}
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기 -> 대기한 시간(초)"""
+        if cassette.is_replay():
+            # 재생 모드는 실제 호출이 없으므로 제한하지 않음
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    self.stats["acquired"] += 1
+                    self.stats["waited"] += waited
+                    return waited
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def throttle(self, retry_after=None):
+        """429 응답: 속도를 절반으로 낮추고 retry_after(초) 동안 호출 중지"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self.blocked_until = max(self.blocked_until, now + pause)
+            self.stats["throttled"] += 1
+
+    def success(self):
+        """성공 응답: 낮췄던 속도를 조금씩 복구"""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get(name):
+    """이름별로 공유되는 버킷 (LIMITS에 없는 이름은 KeyError)"""
+    bucket = _buckets.get(name)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.get(name)
+            if bucket is None:
+                bucket = _buckets[name] = TokenBucket(name, LIMITS[name])
+    return bucket
+
+
+def retry_after(response):
+    """응답의 Retry-After 헤더(초) (없거나 날짜 형식이면 None)"""
+    value = response.headers.get("Retry-After") if response is not None else None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def stats():
+    return {name: dict(bucket.stats, rate=round(bucket.rate, 2)) for name, bucket in _buckets.items()}
+
+
+def print_stats():
+    for name, data in sorted(stats().items()):
+        print(f"    🚦 [RateLimit] {name}: 호출 {data['acquired']}회, 스레드 누적 대기 {data['waited']:.1f}초, "
+              f"429 {data['throttled']}회 (현재 {data['rate']}/초)")
@@ -0,0 +1,97 @@
+"""아카이브 키워드 검색 색인 (키워드 -> 등장한 실행 + 그때의 검색량/포화도)
+
+output/search/<첫 글자 코드>.json처럼 키워드 첫 글자로 나눠 두므로 브라우저는
+입력한 검색어의 첫 글자 파일 하나만 받아 접두어로 찾는다. 실행마다 이번
+결과 키워드가 속한 파일만 읽어서 고쳐 쓴다.
+
+파일 형식: {"runs": [실행 ID, ...], "keywords": {키워드: [[runs 위치, 검색량, 포화도], ...]}}
+실행 ID는 아카이브 파일명에서 .json.gz를 뺀 값 (view.html?run=<ID>.json.gz)
+"""
+import os
+import json
+from src import archive
+
+INDEX_DIR = "output/search"
+SNAPSHOT_SUFFIX = ".json.gz"
+
+
+def normalize(keyword):
+    """공백 제거 + 소문자 (search.js의 normalize와 같아야 함)"""
+    return "".join(keyword.split()).lower()
+
+
+def shard_key(keyword):
+    """첫 글자 유니코드 코드 16진수 ('엘지전자주가' -> 'c5d8')"""
+    normalized = normalize(keyword)
+    return format(ord(normalized[0]), "x") if normalized else None
+
+
+def run_id(filename):
+    return filename[:-len(SNAPSHOT_SUFFIX)] if filename.endswith(SNAPSHOT_SUFFIX) else filename
+
+
+class SearchIndex:
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+
+    def exists(self):
+        return os.path.isdir(self.index_dir)
+
+    def _shard_path(self, key):
+        return os.path.join(self.index_dir, f"{key}.json")
+
+    def read_shard(self, key):
+        path = self._shard_path(key)
+        if not os.path.exists(path):
+            return {"runs": [], "keywords": {}}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_shard(self, key, shard):
+        path = self._shard_path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(shard, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def add_runs(self, runs):
+        """[(실행 ID, keyword_results), ...] 반영 -> 고쳐 쓴 파일 수
+
+        같은 실행 ID가 다시 들어오면 (같은 분에 재실행) 그 실행의 기록을 바꾼다.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        by_shard = {}
+        for rid, results in runs:
+            for item in results:
+                key = shard_key(item["keyword"])
+                if key:
+                    by_shard.setdefault(key, []).append((rid, item))
+
+        for key, postings in by_shard.items():
+            shard = self.read_shard(key)
+            positions = {rid: i for i, rid in enumerate(shard["runs"])}
+            for rid, item in postings:
+                if rid not in positions:
+                    positions[rid] = len(shard["runs"])
+                    shard["runs"].append(rid)
+                position = positions[rid]
+                entries = shard["keywords"].setdefault(item["keyword"], [])
+                entries[:] = [e for e in entries if e[0] != position]
+                entries.append([position, item["monthly_search"], item["saturation"]])
+            self._write_shard(key, shard)
+        return len(by_shard)
+
+    def add_run(self, filename, keyword_results):
+        return self.add_runs([(run_id(filename), keyword_results)])
+
+    def backfill(self, manifest, archive_dir):
+        """색인 도입 전 압축 JSON 아카이브로 한 번 생성 (예전 HTML 스냅샷은 건너뜀) -> 반영한 실행 수"""
+        runs = []
+        for page in range(1, manifest.page_count() + 1):
+            for entry in manifest.read_page(page):
+                path = os.path.join(archive_dir, entry["file"])
+                if entry["file"].endswith(SNAPSHOT_SUFFIX) and os.path.exists(path):
+                    data = archive.read_snapshot(path)
+                    runs.append((run_id(entry["file"]), data.get("keyword_results", [])))
+        self.add_runs(runs)
+        return len(runs)
@@ -0,0 +1,38 @@
+import re
+
+# 맨 앞 출처 말머리 ([언론사], [Daum], [네이버메인] ...)
+_SOURCE_PREFIX = re.compile(r"^\s*\[[^\]]*\]\s*")
+# 제목 안의 태그 ([단독], [속보], (종합) ...)
+_INLINE_TAG = re.compile(r"[\[\(【][^\]\)】]{1,10}[\]\)】]")
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def strip_source(headline):
+    """출처 말머리를 뗀 제목"""
+    return _SOURCE_PREFIX.sub("", headline).strip()
+
+
+def strip_inline_tags(text):
+    """제목 안의 태그([단독], (종합) ...)를 공백으로 바꿈"""
+    return _INLINE_TAG.sub(" ", text)
+
+
+def normalize_headline(headline):
+    """비교용 정규화: 출처/태그/문장부호/공백 제거, 소문자화"""
+    text = strip_inline_tags(strip_source(headline).lower())
+    return _NON_WORD.sub("", text)
+
+
+def estimate_tokens(text):
+    """프롬프트 토큰 수 추정 (한글은 글자당 약 1토큰, 그 외는 4글자당 1토큰)"""
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    others = len(text) - hangul
+    return hangul + (others + 3) // 4
+
+
+def source_of(headline):
+    """출처 말머리 ([언론사] -> 언론사), 없으면 None"""
+    match = _SOURCE_PREFIX.match(headline)
+    if not match:
+        return None
+    return match.group(0).strip()[1:-1]
@@ -0,0 +1,79 @@
+// 아카이브 키워드 검색 (search/<첫 글자 코드>.json 하나만 받아 접두어로 찾음, 형식은 src/search_index.py 참고)
+(function () {
+    const input = document.getElementById('search-input');
+    const list = document.getElementById('search-results');
+    const shards = {};
+    const KEYWORD_LIMIT = 20;
+    const RUN_LIMIT = 10;
+    let latestQuery = 0;
+
+    function normalize(value) {
+        return value.replace(/\s+/g, '').toLowerCase();
+    }
+
+    function escapeHtml(value) {
+        const div = document.createElement('div');
+        div.textContent = String(value);
+        return div.innerHTML;
+    }
+
+    function loadShard(key) {
+        // 없는 파일은 검색 결과 없음으로 처리 (한 번 받은 파일은 재사용)
+        if (!shards[key]) {
+            shards[key] = fetch('search/' + key + '.json')
+                .then(response => response.ok ? response.json() : { runs: [], keywords: {} })
+                .catch(() => ({ runs: [], keywords: {} }));
+        }
+        return shards[key];
+    }
+
+    function runLabel(runId) {
+        const m = /^(\d{4})-(\d{2})-(\d{2})_(\d{2})-(\d{2})/.exec(runId);
+        return m ? m[1] + '.' + m[2] + '.' + m[3] + ' ' + m[4] + ':' + m[5] : runId;
+    }
+
+    function renderKeyword(keyword, postings, runs) {
+        const recent = postings.slice().sort((a, b) => runs[b[0]].localeCompare(runs[a[0]]));
+        const items = recent.slice(0, RUN_LIMIT).map(([position, volume, saturation]) =>
+            '<li><a href="view.html?run=' + encodeURIComponent(runs[position] + '.json.gz') + '" target="_blank">' +
+            '<span class="archive-date">📅 ' + escapeHtml(runLabel(runs[position])) + '</span>' +
+            '<span class="search-metrics">검색량 ' + volume.toLocaleString('en-US') + ' · 포화도 ' + saturation + '</span>' +
+            '</a></li>'
+        );
+        if (recent.length > RUN_LIMIT) {
+            items.push('<li class="search-more">외 ' + (recent.length - RUN_LIMIT) + '회</li>');
+        }
+        return '<li class="search-keyword"><strong>🔑 ' + escapeHtml(keyword) + '</strong>' +
+            '<span class="search-count">' + postings.length + '회 등장</span>' +
+            '<ul>' + items.join('') + '</ul></li>';
+    }
+
+    async function search() {
+        const query = normalize(input.value);
+        const current = ++latestQuery;
+        if (!query) {
+            list.innerHTML = '';
+            return;
+        }
+        const shard = await loadShard(query.codePointAt(0).toString(16));
+        if (current !== latestQuery) {
+            return;  // 응답을 기다리는 동안 검색어가 바뀜
+        }
+        const matches = Object.keys(shard.keywords).filter(kw => normalize(kw).startsWith(query));
+        // 정확히 일치하는 키워드 먼저, 그다음 자주 등장한 순
+        matches.sort((a, b) =>
+            (normalize(b) === query) - (normalize(a) === query) ||
+            shard.keywords[b].length - shard.keywords[a].length ||
+            a.localeCompare(b)
+        );
+        if (!matches.length) {
+            list.innerHTML = '<li class="no-data">검색 결과가 없습니다.</li>';
+            return;
+        }
+        list.innerHTML = matches.slice(0, KEYWORD_LIMIT)
+            .map(kw => renderKeyword(kw, shard.keywords[kw], shard.runs))
+            .join('');
+    }
+
+    input.addEventListener('input', search);
+})();
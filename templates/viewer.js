@@ -0,0 +1,106 @@
+// 아카이브 데이터(.json.gz)를 받아 builder.iter_keyword_report와 같은 마크업으로 렌더링
+// (REPORT_LIMIT, MAX_SATURATION은 builder가 앞에 선언해 둠)
+(function () {
+    const container = document.getElementById('archive-view');
+    const timeLabel = document.getElementById('archive-time');
+    const run = new URLSearchParams(location.search).get('run');
+
+    function escapeHtml(value) {
+        const div = document.createElement('div');
+        div.textContent = String(value);
+        return div.innerHTML;
+    }
+
+    function searchUrl(keyword) {
+        return 'https://search.naver.com/search.naver?query=' + encodeURIComponent(keyword);
+    }
+
+    function renderReport(data) {
+        const results = data.keyword_results || [];
+        if (!results.length) {
+            return '<p>분석된 키워드가 없습니다.</p>';
+        }
+        const top = results.filter(r => r.saturation <= MAX_SATURATION).slice(0, REPORT_LIMIT);
+        const parts = [
+            '<div class="keyword-report">',
+            '<h3>📊 상위노출 가능 키워드 TOP ' + REPORT_LIMIT + '</h3>',
+            '<p class="update-info">포화도 = 블로그문서수 ÷ 월간검색량 (낮을수록 상위노출 쉬움)</p>',
+            '<table class="keyword-table"><thead><tr>',
+            '<th>순위</th><th>키워드</th><th>월간검색량</th><th>블로그문서수</th>',
+            '<th>포화도</th><th>상위노출</th><th>분석</th>',
+            '</tr></thead><tbody>'
+        ];
+        top.forEach((item, idx) => {
+            parts.push(
+                '<tr><td>' + (idx + 1) + '</td>' +
+                '<td><strong>' + escapeHtml(item.keyword) + '</strong></td>' +
+                '<td>' + item.monthly_search.toLocaleString('en-US') + '</td>' +
+                '<td>' + item.blog_count.toLocaleString('en-US') + '</td>' +
+                '<td>' + item.saturation + '</td>' +
+                '<td>' + escapeHtml(item.possibility) + '</td>' +
+                '<td><a href="' + searchUrl(item.keyword) + '" target="_blank" class="analyze-btn">🔍</a></td></tr>'
+            );
+        });
+        parts.push('</tbody></table></div>');
+
+        const related = data.related_data || [];
+        if (related.length) {
+            parts.push(
+                '<div class="related-keywords">',
+                '<h3>🔗 상위 20개 키워드 연관검색어</h3>',
+                '<p class="update-info">네이버 자동완성 기반 연관검색어입니다.</p>',
+                '<div class="related-grid">'
+            );
+            related.forEach(item => {
+                parts.push(
+                    '<div class="related-card"><div class="related-header">' +
+                    '<strong>' + escapeHtml(item.keyword) + '</strong>' +
+                    '<a href="' + searchUrl(item.keyword) + '" target="_blank" class="analyze-btn">🔍</a>' +
+                    '</div><ul class="related-list">'
+                );
+                (item.related || []).forEach(kw => {
+                    parts.push('<li><a href="' + searchUrl(kw) + '" target="_blank">' + escapeHtml(kw) + '</a></li>');
+                });
+                if (!(item.related || []).length) {
+                    parts.push('<li class="no-data">연관검색어 없음</li>');
+                }
+                parts.push('</ul>');
+                if ((item.expanded || []).length) {
+                    parts.push('<div class="related-more">');
+                    item.expanded.forEach(kw => {
+                        parts.push('<a href="' + searchUrl(kw) + '" target="_blank">' + escapeHtml(kw) + '</a>');
+                    });
+                    parts.push('</div>');
+                }
+                parts.push('</div>');
+            });
+            parts.push('</div></div>');
+        }
+        return parts.join('');
+    }
+
+    async function load() {
+        if (!run || !/^[\p{L}\p{N}_\-]+\.json\.gz$/u.test(run)) {
+            container.innerHTML = '<p>잘못된 아카이브 주소입니다.</p>';
+            return;
+        }
+        const response = await fetch('archive/' + encodeURIComponent(run));
+        if (!response.ok) {
+            throw new Error(response.status);
+        }
+        // 정적 호스팅은 .gz를 압축된 그대로 내려주므로 브라우저에서 직접 해제
+        const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+        const data = JSON.parse(await new Response(stream).text());
+
+        timeLabel.textContent = data.update_time || '';
+        container.innerHTML = renderReport(data);
+        // 레이아웃의 표 정렬 설정 (아직 정의 전이면 레이아웃의 DOMContentLoaded 처리에서 연결됨)
+        if (window.initKeywordTable) {
+            window.initKeywordTable();
+        }
+    }
+
+    load().catch(error => {
+        container.innerHTML = '<p>아카이브를 불러오지 못했습니다. (' + escapeHtml(error.message) + ')</p>';
+    });
+})();